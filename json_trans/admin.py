@@ -1,17 +1,200 @@
+from collections import OrderedDict
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.conf import settings
-from django.utils.translation import get_language
+from django.utils.text import capfirst
+from django.utils.translation import get_language, gettext_lazy as _
+
+from .forms import LANGUAGES, translation_field_name
+from .storage import translated_lookup
+
+TRANSLATED_ALIAS = '%s_translated'
+SEARCH_PREFIXES = ('^', '=', '@')
+
+
+def translated_column(model, field_name):
+    """
+    Returns a `list_display` callable showing the `TRANSLATED_ALIAS`
+    annotation of `field_name` added by `TranslatableModelAdmin.get_queryset()`,
+    sortable on the same expression.
+    """
+    alias = TRANSLATED_ALIAS % field_name
+
+    def column(obj):
+        return getattr(obj, alias, None)
+
+    column.__name__ = field_name
+    column.short_description = capfirst(model._meta.get_field(field_name).verbose_name)
+    column.admin_order_field = alias
+    return column
+
+
+class TranslationFilter(admin.SimpleListFilter):
+    """
+    Filters the changelist by whether objects are translated to a language,
+    with the containment filter of `TranslationQuerySet.language()`.
+    """
+    title = _('translation')
+    parameter_name = 'translation'
+    missing_prefix = '!'
+
+    def lookups(self, request, model_admin):
+        choices = []
+
+        for code, name in LANGUAGES.items():
+            if code != settings.LANGUAGE_CODE:
+                choices.append((code, _('Translated to %s') % name))
+                choices.append((self.missing_prefix + code, _('Missing %s') % name))
+
+        return choices
+
+    def queryset(self, request, queryset):
+        value = self.value()
+
+        if not value:
+            return queryset
+
+        code = value[len(self.missing_prefix):] if value.startswith(self.missing_prefix) else value
+
+        if code not in LANGUAGES:
+            return queryset
+
+        lookup = translated_lookup(queryset.model, code)
+
+        if value.startswith(self.missing_prefix):
+            return queryset.exclude(lookup)
+
+        return queryset.filter(lookup)
+
+
+class TranslatedChangeList(ChangeList):
+    """
+    Changelist of `TranslatableModelAdmin`, its queryset has the translated
+    values of `get_translated_names()` annotated. Other views of the admin
+    load objects without them.
+    """
+
+    def get_queryset(self, request):
+        self.root_queryset = self.model_admin.annotate_translated(
+            self.root_queryset, self.model_admin.get_translated_names(request),
+        )
+        return super().get_queryset(request)
+
+    def _get_default_ordering(self):
+        # Also matched against the columns' admin_order_field for the sort indicators.
+        return self.model_admin.translated_ordering(super()._get_default_ordering())
+
+    def get_ordering(self, request, queryset):
+        return self.model_admin.translated_ordering(super().get_ordering(request, queryset))
 
 
 class TranslatableModelAdmin(admin.ModelAdmin):
 
     def get_fields(self, request, obj=None):
-        gf = super().get_fields(request, obj)
-        for f in self.form().translatable_fields:
-            if f[0] not in gf:
-                gf.append(f[0])
-            self.form.declared_fields.update({f[0]: f[1]})
-        return gf
+        fields = list(super().get_fields(request, obj))
+
+        if getattr(self.form, '_mode', None) == 'multi':
+            # The form class generates the per language fields, only add the
+            # names missing from explicitly set `fields`.
+            for name in list(fields):
+                if name in self.model._meta.translatable_fields:
+                    for code in LANGUAGES:
+                        translated_name = translation_field_name(name, code)
+                        if code != settings.LANGUAGE_CODE and translated_name not in fields:
+                            fields.append(translated_name)
+
+        return fields
+
+    def __init__(self, model, admin_site):
+        super().__init__(model, admin_site)
+        self._translated_columns = {}
+
+    def get_translated_column(self, field_name):
+        if field_name not in self._translated_columns:
+            self._translated_columns[field_name] = translated_column(self.model, field_name)
+        return self._translated_columns[field_name]
+
+    def is_translated_name(self, name):
+        return isinstance(name, str) and name in self.model._meta.translatable_fields
+
+    def get_translated_names(self, request):
+        """
+        Returns the translatable fields shown or sorted in the changelist,
+        annotated by `TranslatedChangeList`.
+        """
+        columns = {column: name for name, column in self._translated_columns.items()}
+        names = [columns.get(name, name) for name in self.get_list_display(request)]
+        names += [
+            name.lstrip('-') for name in self.get_ordering(request) or self.model._meta.ordering
+            if isinstance(name, str)
+        ]
+        names = [name for name in names if self.is_translated_name(name)]
+        return [name for name in OrderedDict.fromkeys(names) if name]
+
+    def annotate_translated(self, queryset, names):
+        """
+        Annotates the translated values of `names` in the active language
+        (falling back as configured), so they're shown, sorted and searched in
+        SQL. Already annotated ones are skipped.
+        """
+        fields = {
+            TRANSLATED_ALIAS % name: name for name in names
+            if TRANSLATED_ALIAS % name not in queryset.query.annotations
+        }
+
+        if fields and hasattr(queryset, 'translated_annotate'):
+            queryset = queryset.translated_annotate(get_language(), **fields)
+
+        return queryset
+
+    def get_changelist(self, request, **kwargs):
+        return TranslatedChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term:
+            # The changelist and the autocomplete views search the annotations.
+            aliases = {TRANSLATED_ALIAS % name: name for name in self.model._meta.translatable_fields}
+            names = [aliases.get(name.lstrip(''.join(SEARCH_PREFIXES))) for name in self.get_search_fields(request)]
+            queryset = self.annotate_translated(queryset, [name for name in names if name])
+
+        return super().get_search_results(request, queryset, search_term)
+
+    def get_list_display(self, request):
+        list_editable = self.list_editable or ()
+        return [
+            self.get_translated_column(name) if self.is_translated_name(name) and name not in list_editable else name
+            for name in super().get_list_display(request)
+        ]
+
+    def get_list_display_links(self, request, list_display):
+        links = super().get_list_display_links(request, list_display)
+
+        if not links:
+            return links
+
+        return [self.get_translated_column(name) if self.is_translated_name(name) else name for name in links]
+
+    def translated_ordering(self, ordering):
+        """
+        Returns `ordering` sorting translatable fields by their annotation.
+        """
+        return [
+            name.replace(name.lstrip('-'), TRANSLATED_ALIAS % name.lstrip('-'))
+            if isinstance(name, str) and self.is_translated_name(name.lstrip('-')) else name
+            for name in ordering or ()
+        ]
+
+    def get_search_fields(self, request):
+        search_fields = []
+
+        for name in super().get_search_fields(request):
+            prefix = name[0] if name[:1] in SEARCH_PREFIXES else ''
+            if self.is_translated_name(name[len(prefix):]):
+                name = prefix + TRANSLATED_ALIAS % name[len(prefix):]
+            search_fields.append(name)
+
+        return search_fields
 
     def prepare_extra_context(self, extra_context):
         extra_context = extra_context or {}
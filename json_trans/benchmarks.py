@@ -0,0 +1,347 @@
+"""
+Benchmarks of the json_trans hot paths, run with `manage.py json_trans_benchmark`.
+
+In memory benchmarks run on any database backend. Query benchmarks need
+PostgreSQL: they create a temporary table in a transaction which is rolled
+back at the end. Results are microseconds per operation, they can be stored
+as a JSON baseline and compared with a later run.
+"""
+import json
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connections, models, transaction
+
+LANGUAGE_CODE = settings.LANGUAGE_CODE
+TRANSLATABLE_FIELDS = ('title', 'description')
+
+BENCHMARKS = OrderedDict()
+_benchmark_model = None
+
+
+class Rollback(Exception):
+    pass
+
+
+def benchmark(name, database=False, parametrize=()):
+    """
+    Registers a benchmark. The decorated function gets the options and the
+    parameters named in `parametrize` (`rows` and/or `languages`) and returns
+    `(run, operations)`, `run` being timed and doing `operations` operations.
+    """
+    def decorator(func):
+        BENCHMARKS[name] = (func, database, parametrize)
+        return func
+    return decorator
+
+
+def get_benchmark_model():
+    """
+    Returns a TranslatableModel registered in its own app registry, so it
+    doesn't show up in the project's models and migrations.
+    """
+    global _benchmark_model
+
+    if _benchmark_model is None:
+        from django.apps.registry import Apps
+        from .models import TranslatableModel
+
+        class Meta:
+            app_label = 'json_trans'
+            db_table = 'json_trans_benchmark'
+            translatable_fields = TRANSLATABLE_FIELDS
+            apps = Apps([])
+
+        _benchmark_model = type('Benchmark', (TranslatableModel,), {
+            '__module__': __name__,
+            'Meta': Meta,
+            'title': models.CharField(max_length=255),
+            'description': models.TextField(),
+            'price': models.IntegerField(default=0),
+        })
+
+    return _benchmark_model
+
+
+def target_language():
+    for code, name in settings.LANGUAGES:
+        if code != LANGUAGE_CODE:
+            return code
+
+    raise ValueError('Benchmarks need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+
+
+def make_translations(index, languages):
+    """
+    Returns a translations dict of `languages` languages, the target language
+    and made up codes to reach the wanted size.
+    """
+    codes = [target_language()] + ['x%d' % i for i in range(languages - 1)]
+    return {
+        code: {'title': 'Title %d %s' % (index, code), 'description': 'Description %d %s' % (index, code) * 10}
+        for code in codes
+    }
+
+
+def make_instance(index=0, languages=2):
+    model = get_benchmark_model()
+    values = [index, make_translations(index, languages), 'Title %d' % index, 'Description %d' % index, index]
+    return model.from_db('default', None, values)
+
+
+def populate(rows, languages, using):
+    model = get_benchmark_model()
+    model.objects.using(using).all().delete()
+    model.objects.using(using).bulk_create(
+        [model(translations=make_translations(i, languages), title='Title %d' % i, description='Description %d' % i,
+               price=i) for i in range(rows)],
+        batch_size=1000,
+    )
+
+
+@benchmark('translated_read', parametrize=('languages',))
+def translated_read(options, languages):
+    from django.utils import translation
+
+    obj = make_instance(languages=languages).language(target_language())
+    number = 10000
+
+    def run():
+        with translation.override(target_language()):
+            for i in range(number):
+                obj.title
+
+    return run, number
+
+
+@benchmark('plain_read')
+def plain_read(options):
+    from django.utils import translation
+
+    obj = make_instance().language(target_language())
+    number = 10000
+
+    def run():
+        with translation.override(target_language()):
+            for i in range(number):
+                obj.price
+
+    return run, number
+
+
+@benchmark('row_construction', parametrize=('rows', 'languages'))
+def row_construction(options, rows, languages):
+    """
+    What TranslationModelIterable does per row, without the database.
+    """
+    from .managers import TranslationQuerySet
+
+    model = get_benchmark_model()
+    code = target_language()
+    values = [[i, make_translations(i, languages), 'Title', 'Description', i] for i in range(rows)]
+    queryset = TranslationQuerySet(model).language_or_default(code)
+
+    def run():
+        is_default = queryset.is_default_language(code)
+        for row in values:
+            model.from_db('default', None, row)._activate_language(code, is_default)
+
+    return run, rows
+
+
+@benchmark('row_language', parametrize=('rows', 'languages'))
+def row_language(options, rows, languages):
+    """
+    `row_construction` resolving the language per object with `language()`,
+    as querysets did before resolving it once per iteration.
+    """
+    model = get_benchmark_model()
+    code = target_language()
+    values = [[i, make_translations(i, languages), 'Title', 'Description', i] for i in range(rows)]
+
+    def run():
+        for row in values:
+            model.from_db('default', None, row).language(code)
+
+    return run, rows
+
+
+@benchmark('translate', parametrize=('languages',))
+def translate(options, languages):
+    obj = make_instance(languages=languages)
+    code = target_language()
+    number = 1000
+
+    def run():
+        for i in range(number):
+            obj.translate(code, title='Title %d' % i)
+
+    return run, number
+
+
+@benchmark('form_construction')
+def form_construction(options):
+    from django.forms import modelform_factory
+    from .forms import MultiLanguageModelForm
+
+    form_class = modelform_factory(get_benchmark_model(), form=MultiLanguageModelForm, fields=TRANSLATABLE_FIELDS)
+    number = 100
+
+    def run():
+        for i in range(number):
+            form_class()
+
+    return run, number
+
+
+@benchmark('iteration', database=True, parametrize=('rows', 'languages'))
+def iteration(options, rows, languages):
+    populate(rows, languages, options['database'])
+    queryset = get_benchmark_model().objects.using(options['database']).language(target_language())
+
+    def run():
+        for obj in queryset.all():
+            obj.title
+
+    return run, rows
+
+
+@benchmark('filter', database=True, parametrize=('rows', 'languages'))
+def filter_(options, rows, languages):
+    populate(rows, languages, options['database'])
+    code = target_language()
+    queryset = get_benchmark_model().objects.using(options['database']).language(code)
+    value = 'Title %d %s' % (rows // 2, code)
+
+    def run():
+        list(queryset.filter(title=value))
+
+    return run, 1
+
+
+@benchmark('order_by_json_path', database=True, parametrize=('rows', 'languages'))
+def order_by_json_path(options, rows, languages):
+    populate(rows, languages, options['database'])
+    queryset = get_benchmark_model().objects.using(options['database']).language(target_language())
+
+    def run():
+        list(queryset.order_by_json_path('title')[:50])
+
+    return run, 1
+
+
+@benchmark('translate_save', database=True, parametrize=('languages',))
+def translate_save(options, languages):
+    number = 100
+    populate(number, languages, options['database'])
+    objs = list(get_benchmark_model().objects.using(options['database']).all())
+    code = target_language()
+
+    def run():
+        for obj in objs:
+            obj.translate(code, title='Changed %s' % obj.pk)
+            obj.save()
+
+    return run, number
+
+
+def parameter_sets(parametrize, options):
+    sets = [OrderedDict()]
+
+    for name in parametrize:
+        sets = [OrderedDict(params, **{name: value}) for params in sets for value in options[name]]
+
+    return sets
+
+
+def benchmark_name(name, params):
+    if not params:
+        return name
+    return '%s[%s]' % (name, ','.join('%s=%s' % item for item in params.items()))
+
+
+def time_benchmark(func, options, params):
+    run, operations = func(options, **params)
+    timings = []
+
+    for i in range(options['repeat']):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) / operations * 1e6
+
+
+def create_benchmark_table(connection, indexes=False):
+    from .indexes import create_index_sql, translation_indexes
+
+    model = get_benchmark_model()
+
+    with connection.schema_editor(atomic=False) as editor:
+        editor.create_model(model)
+
+    if indexes:
+        with connection.cursor() as cursor:
+            for index in translation_indexes(model, languages=[target_language()], connection=connection):
+                cursor.execute(create_index_sql(model, connection, *index))
+
+
+def run_benchmarks(options, names=None, output=None):
+    """
+    Runs the benchmarks and returns `{name: microseconds per operation}`.
+    Database benchmarks run in a transaction rolled back at the end.
+    """
+    results = OrderedDict()
+    connection = connections[options['database']]
+    selected = [(name, BENCHMARKS[name]) for name in (names or BENCHMARKS)]
+    use_database = options['with_database'] and connection.vendor == 'postgresql'
+
+    def run(database):
+        for name, (func, needs_database, parametrize) in selected:
+            if needs_database != database:
+                continue
+
+            for params in parameter_sets(parametrize, options):
+                key = benchmark_name(name, params)
+                results[key] = time_benchmark(func, options, params)
+
+                if output:
+                    output(key, results[key])
+
+    run(False)
+
+    if use_database:
+        try:
+            with transaction.atomic(using=options['database']):
+                create_benchmark_table(connection, options['indexes'])
+                run(True)
+                raise Rollback
+        except Rollback:
+            pass
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Returns `(name, value, baseline value, change ratio, regressed)` rows.
+    """
+    rows = []
+
+    for name, value in results.items():
+        base = baseline.get(name)
+        change = (value - base) / base if base else None
+        rows.append((name, value, base, change, change is not None and change > threshold))
+
+    return rows
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump({'unit': 'us/op', 'results': results}, f, indent=2, sort_keys=True)
@@ -0,0 +1,90 @@
+"""
+Optional cross-request cache of the result sets of
+`TranslationQuerySet.cached()`. Enabled by setting `JSON_TRANS_CACHE` to a
+cache alias of `settings.CACHES` (or True for the default cache),
+`JSON_TRANS_CACHE_TIMEOUT` sets the timeout of the entries.
+
+Result sets are kept per language under
+`json_trans:<model>:<version>:results:<language>:<key>`. Instances are
+stored in their compact pickled state (see
+`TranslatableModel.get_compact_state()`). Saving or deleting an object and
+queryset level updates bump the version of its model, so all of its result
+sets are dropped at once.
+"""
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+CACHE_ALIAS = getattr(settings, 'JSON_TRANS_CACHE', None)
+CACHE_TIMEOUT = getattr(settings, 'JSON_TRANS_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+KEY_PREFIX = 'json_trans'
+
+
+def get_cache():
+    if CACHE_ALIAS:
+        return caches[DEFAULT_CACHE_ALIAS if CACHE_ALIAS is True else CACHE_ALIAS]
+
+
+def is_enabled():
+    return bool(CACHE_ALIAS)
+
+
+def version_key(model):
+    return '%s:%s:version' % (KEY_PREFIX, model._meta.label_lower)
+
+
+def get_version(model, cache):
+    version = cache.get(version_key(model))
+
+    if version is None:
+        version = 1
+        cache.add(version_key(model), version, None)
+
+    return version
+
+
+def results_key(model, cache, language_code, key):
+    """
+    Returns the cache key of a result set. The version is read once, results
+    fetched after an invalidation are stored under the old one.
+    """
+    return '%s:%s:%s:results:%s:%s' % (KEY_PREFIX, model._meta.label_lower, get_version(model, cache), language_code, key)
+
+
+def from_state(model, state):
+    """
+    Returns an instance of `model` from a `get_compact_state()` state.
+    """
+    instance = model.__new__(model)
+    instance.__dict__.update(state)
+    return instance
+
+
+def invalidate_model(model):
+    """
+    Drops the cached result sets of `model`.
+    """
+    cache = get_cache()
+
+    if cache is None:
+        return
+
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.set(version_key(model), 2, None)
+
+
+def invalidate(instance):
+    """
+    Drops the cached result sets of the model of a saved or deleted `instance`.
+    """
+    if instance.pk is not None:
+        invalidate_model(type(instance))
+
+
+def record_delete(sender, instance, **kwargs):
+    """
+    post_delete receiver of translatable models when the cache is enabled.
+    """
+    invalidate(instance)
@@ -0,0 +1,328 @@
+"""
+Translation coverage: how many objects of a model have each translatable
+field filled (not missing, null or '') in each language, the base columns
+counting for `LANGUAGE_CODE`.
+
+`compute_coverage()` computes it in a single query per model, expanding the
+`translations` column with `jsonb_each()`/`jsonb_each_text()`. With
+`settings.JSON_TRANS_COVERAGE` the numbers are also kept in the
+`TranslationCoverage` summary table: `refresh()` (or
+`manage.py json_trans_coverage --refresh`) fills it, then every write
+updates it incrementally. `save()` and deletes apply the changes of their
+object, queryset level updates, `bulk_translate()` and `bulk_create()` count
+the filled pairs of the rows they write before and after the write, in its
+transaction (see `track()`). Only deleting an object of a sliced queryset
+refreshes the model's rows, once the transaction commits.
+"""
+from collections import Counter, OrderedDict, namedtuple
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+
+from .expressions import sliced_translations
+from .storage import is_table_storage, translation_table
+
+LANGUAGES = OrderedDict(settings.LANGUAGES)
+LANGUAGE_CODE = settings.LANGUAGE_CODE
+COVERAGE = getattr(settings, 'JSON_TRANS_COVERAGE', False)
+
+
+class CoverageRow(namedtuple('CoverageRow', 'model language field translated total')):
+    __slots__ = ()
+
+    @property
+    def ratio(self):
+        return self.translated / self.total if self.total else 1.0
+
+
+def is_enabled():
+    return bool(COVERAGE)
+
+
+def coverage_sql(model, connection, languages, fields, pks=None):
+    """
+    Returns the SQL and params of `(language, field, count)` rows, plus a
+    `(NULL, NULL, total)` row, of the whole table or of the rows `pks`.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    table = qn(opts.db_table)
+    where = '' if pks is None else ' WHERE %s.%s = ANY(%%s)' % (table, qn(opts.pk.column))
+    translations = '%s.%s' % (table, qn(opts.get_field('translations').column))
+
+    if is_table_storage(model):
+        translations = "(SELECT jsonb_object_agg(language_code, data) FROM %s WHERE master_id = %s.%s)" % (
+            qn(translation_table(model)), table, qn(opts.pk.column),
+        )
+    base_values = ', '.join(
+        '(%%s, %%s, %s.%s::text)' % (table, qn(opts.get_field(name).column)) for name in fields
+    )
+
+    sql = (
+        "SELECT f.language, f.field, count(*) FROM {table} CROSS JOIN LATERAL ("
+        "SELECT l.key, e.key, e.value "
+        "FROM jsonb_each(CASE WHEN jsonb_typeof({translations}) = 'object' THEN {translations} ELSE '{{}}' END) l "
+        "CROSS JOIN LATERAL jsonb_each_text(CASE WHEN jsonb_typeof(l.value) = 'object' THEN l.value ELSE '{{}}' END) e "
+        "WHERE l.key <> %s "
+        "UNION ALL VALUES {base_values}"
+        ") AS f (language, field, value){where}{filter} "
+        "f.value <> '' AND f.language = ANY(%s) AND f.field = ANY(%s) "
+        "GROUP BY f.language, f.field "
+        "UNION ALL SELECT NULL, NULL, count(*) FROM {table}{where}"
+    ).format(
+        table=table, translations=translations, base_values=base_values, where=where,
+        filter=' AND' if where else ' WHERE',
+    )
+
+    # The base columns stand for LANGUAGE_CODE.
+    params = [LANGUAGE_CODE]
+    for name in fields:
+        params += [LANGUAGE_CODE, name]
+
+    pk_params = [] if pks is None else [list(pks)]
+
+    return sql, params + pk_params + [list(languages), list(fields)] + pk_params
+
+
+def count_filled(model, using, languages, fields, pks=None):
+    """
+    Returns a `Counter` of the filled `(language, field)` pairs of the whole
+    table or of the rows `pks`, and the number of rows.
+    """
+    sql, params = coverage_sql(model, connections[using], languages, fields, pks)
+    counts = Counter()
+    total = 0
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, params)
+
+        for language, field, count in cursor.fetchall():
+            if language is None:
+                total = count
+            else:
+                counts[language, field] = count
+
+    return counts, total
+
+
+def compute_coverage(model, languages=None, fields=None, using=DEFAULT_DB_ALIAS):
+    """
+    Returns a `CoverageRow` per language and field of `model`, in the order
+    of `languages` (`settings.LANGUAGES` by default) and `fields` (the
+    translatable fields by default).
+    """
+    languages = list(languages or LANGUAGES)
+    fields = list(fields or model._meta.translatable_fields)
+    counts, total = count_filled(model, using, languages, fields)
+
+    return [
+        CoverageRow(model._meta.label, language, field, counts.get((language, field), 0), total)
+        for language in languages for field in fields
+    ]
+
+
+def get_coverage(model, languages=None, fields=None, using=DEFAULT_DB_ALIAS):
+    """
+    Same as `compute_coverage()` but reads the summary table when it's enabled.
+    """
+    from .models import TranslationCoverage
+
+    if not is_enabled():
+        return compute_coverage(model, languages, fields, using)
+
+    languages = list(languages or LANGUAGES)
+    fields = list(fields or model._meta.translatable_fields)
+    rows = TranslationCoverage.objects.using(using).filter(model=model._meta.label)
+    stored = {(row.language, row.field): row for row in rows}
+
+    return [
+        CoverageRow(
+            model._meta.label, language, field,
+            getattr(stored.get((language, field)), 'translated', 0), getattr(stored.get((language, field)), 'total', 0),
+        )
+        for language in languages for field in fields
+    ]
+
+
+def refresh(model, using=DEFAULT_DB_ALIAS):
+    """
+    Recomputes the summary rows of `model`.
+    """
+    from .models import TranslationCoverage
+
+    rows = compute_coverage(model, using=using)
+
+    with transaction.atomic(using=using):
+        TranslationCoverage.objects.using(using).filter(model=model._meta.label).delete()
+        TranslationCoverage.objects.using(using).bulk_create([
+            TranslationCoverage(model=row.model, language=row.language, field=row.field,
+                                translated=row.translated, total=row.total)
+            for row in rows
+        ])
+
+    return rows
+
+
+@contextmanager
+def track(model, using, pks):
+    """
+    Applies the coverage changes of the rows `pks` written in the block: the
+    rows are locked and their filled pairs counted before and after it, in
+    the same transaction.
+    Usage example:
+        with track(Product, 'default', pks):
+            Product._base_manager.filter(pk__in=pks).update(title='')
+    """
+    if not is_enabled() or not pks:
+        yield
+        return
+
+    languages = list(LANGUAGES)
+    fields = list(model._meta.translatable_fields)
+
+    with transaction.atomic(using=using, savepoint=False):
+        list(model._base_manager.using(using).filter(pk__in=pks).select_for_update().values_list('pk'))
+        before = count_filled(model, using, languages, fields, pks)[0]
+
+        yield
+
+        after = count_filled(model, using, languages, fields, pks)[0]
+        apply(model, using, after, before)
+
+
+def record_create(model, using, pks):
+    """
+    Adds the rows `pks` inserted by a bulk write to the summary, call it in
+    the transaction of the write.
+    """
+    if is_enabled() and pks:
+        counts, total = count_filled(model, using, list(LANGUAGES), list(model._meta.translatable_fields), pks)
+        apply(model, using, counts, total=total)
+
+
+def schedule_refresh(model, using=DEFAULT_DB_ALIAS):
+    """
+    Refreshes the summary rows of `model` when the current transaction
+    commits, once per transaction.
+    """
+    if not is_enabled():
+        return
+
+    key = (model._meta.label, using)
+    connection = transaction.get_connection(using)
+
+    if any(getattr(entry[1], 'coverage_key', None) == key for entry in connection.run_on_commit):
+        return
+
+    def run():
+        refresh(model, using)
+
+    run.coverage_key = key
+    transaction.on_commit(run, using=using)
+
+
+def filled(translations, values, languages=None):
+    """
+    Returns the `(language, field)` pairs filled in `translations` and in the
+    base column `values` (`{field: value}`).
+    """
+    result = {(LANGUAGE_CODE, name) for name, value in values.items() if value not in (None, '')}
+
+    for code, fields in (translations or {}).items():
+        if isinstance(fields, dict) and code != LANGUAGE_CODE and (languages is None or code in languages):
+            result.update((code, name) for name, value in fields.items()
+                          if name in values and value not in (None, ''))
+
+    return result
+
+
+def stored_filled(instance, using):
+    """
+    Returns the `filled()` pairs of the stored row of `instance`.
+    """
+    model = type(instance)
+    fields = model._meta.translatable_fields
+    # Locked until the write of the save is committed.
+    row = model._base_manager.using(using).filter(pk=instance.pk).select_for_update().annotate(
+        _translations=sliced_translations(LANGUAGES, model) if is_table_storage(model) else F('translations'),
+    ).values_list('_translations', *fields).first()
+
+    if row is None:
+        return set()
+
+    return filled(row[0], dict(zip(fields, row[1:])), LANGUAGES)
+
+
+def instance_filled(instance, previous=None):
+    """
+    Returns the `filled()` pairs of `instance`. Languages a sliced instance
+    didn't load are taken from `previous`.
+    """
+    model = type(instance)
+    values = {name: getattr(model, name).get_default(instance) for name in model._meta.translatable_fields}
+    result = filled(instance.translations, values, instance._loaded_languages or LANGUAGES)
+
+    if instance._loaded_languages is not None and previous:
+        loaded = set(instance._loaded_languages) | {LANGUAGE_CODE}
+        result.update(pair for pair in previous if pair[0] not in loaded)
+
+    return result
+
+
+def apply(model, using, added=(), removed=(), total=0):
+    """
+    Applies the changes of written or deleted objects to the summary rows of
+    `model`, `added` and `removed` being `(language, field)` pairs, or their
+    `Counter`. Models without summary rows are left alone until refreshed.
+    """
+    from .models import TranslationCoverage
+
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    deltas = {pair: delta for pair, delta in deltas.items() if delta}
+
+    if total:
+        for language in LANGUAGES:
+            for field in model._meta.translatable_fields:
+                deltas.setdefault((language, field), 0)
+
+    if not deltas:
+        return
+
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    table = qn(TranslationCoverage._meta.db_table)
+    values = ', '.join(['(%s, %s, %s::integer)'] * len(deltas))
+    sql = (
+        "UPDATE {table} SET translated = {table}.translated + v.delta, total = {table}.total + %s, updated_at = now() "
+        "FROM (VALUES {values}) AS v (language, field, delta) "
+        "WHERE {table}.model = %s AND {table}.language = v.language AND {table}.field = v.field"
+    ).format(table=table, values=values)
+
+    params = [total]
+    for (language, field), delta in deltas.items():
+        params += [language, field, delta]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params + [model._meta.label])
+
+
+def record_save(instance, previous, created, using):
+    """
+    Updates the summary after `instance` was saved, `previous` being the
+    `stored_filled()` pairs before the save.
+    """
+    current = instance_filled(instance, previous)
+    apply(type(instance), using, current - previous, previous - current, 1 if created else 0)
+
+
+def record_delete(sender, instance, using, **kwargs):
+    """
+    post_delete receiver of translatable models when the summary is enabled.
+    """
+    if instance._loaded_languages is not None:
+        schedule_refresh(sender, using)
+    else:
+        apply(sender, using, removed=instance_filled(instance), total=-1)
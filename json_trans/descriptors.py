@@ -0,0 +1,196 @@
+import time
+
+from django.db.models import FileField
+from django.utils.translation import get_language
+
+from . import instrumentation
+from .fallback import get_fallback_chain
+from .files import stored_name
+from .signals import missing_translation
+
+
+class TranslatedFieldDescriptor(object):
+    """
+    Installed on every name in ``Meta.translatable_fields`` when a
+    ``TranslatableModel`` subclass is prepared. Reads return the value of the
+    translation picked by ``TranslatableModel.language()`` and writes go to
+    the base column, so the rest of the model attributes keep their native
+    access speed.
+    """
+
+    def __init__(self, field, descriptor=None):
+        self.field = field
+        self.name = field.name
+        self.attname = field.attname
+        # The descriptor django installed for the base column, e.g.
+        # DeferredAttribute or FileDescriptor.
+        self.descriptor = descriptor
+        self.is_file = isinstance(field, FileField)
+        self.has_setter = hasattr(descriptor, '__set__')
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        translated = instance._translated
+
+        if translated is not None and get_language() != instance.default_language_code:
+            try:
+                return translated[self.name]
+            except KeyError:
+                return self.resolve(instance, translated)
+
+        return self.get_default(instance)
+
+    def __set__(self, instance, value):
+        if self.has_setter:
+            self.descriptor.__set__(instance, value)
+        else:
+            instance.__dict__[self.attname] = value
+
+        if instance._translated:
+            # The language may have resolved to the base column.
+            instance._translated.pop(self.name, None)
+
+    def get_default(self, instance):
+        """
+        Return the value of the base (default language) column.
+        """
+        if not self.has_setter:
+            try:
+                return instance.__dict__[self.attname]
+            except KeyError:
+                pass
+
+        if self.descriptor is None:
+            raise AttributeError(self.attname)
+
+        return self.descriptor.__get__(instance, type(instance))
+
+    def resolve(self, instance, translated):
+        """
+        Resolve the field from the instance's translations, walking the
+        language's fallback chain, and cache the result so later reads are a
+        single dict lookup.
+        """
+        language_code, value = self.lookup(instance)
+
+        if language_code == instance.default_language_code:
+            translated[self.name] = value
+            return value
+
+        if self.is_file:
+            value = self.get_file(instance, language_code or instance._language_code, value)
+
+        translated[self.name] = value
+        return value
+
+    def lookup(self, instance):
+        """
+        Return the language of the fallback chain the field is translated to,
+        None if it's missing in all of them, and the value.
+        """
+        translations = instance.translations or {}
+
+        for language_code in get_fallback_chain(instance._language_code, instance.fallback):
+            if language_code == instance.default_language_code:
+                return language_code, self.get_default(instance)
+
+            value = (translations.get(language_code) or {}).get(self.name)
+
+            if value not in (None, ''):
+                return language_code, value
+
+        return None, ''
+
+    def get_file(self, instance, language_code, name):
+        """
+        Return the FieldFile of the stored `name`, reused for the instance and
+        language as long as the name doesn't change.
+        """
+        files = instance.__dict__.setdefault('_translated_files', {})
+        name = stored_name(self.field.storage, name)
+        value = files.get((self.name, language_code))
+
+        if value is None or value.name != name:
+            value = files[(self.name, language_code)] = self.field.attr_class(instance, self.field, name)
+
+        return value
+
+
+class InstrumentedTranslatedFieldDescriptor(TranslatedFieldDescriptor):
+    """
+    Installed in place of ``TranslatedFieldDescriptor`` when
+    ``JSON_TRANS_INSTRUMENTATION`` is set, records reads, fallbacks and
+    missing translations.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        start = time.perf_counter()
+        value = super(InstrumentedTranslatedFieldDescriptor, self).__get__(instance, cls)
+        instrumentation.record('reads', 1, 'read', time.perf_counter() - start)
+        return value
+
+    def lookup(self, instance):
+        language_code, value = super(InstrumentedTranslatedFieldDescriptor, self).lookup(instance)
+        instrumentation.record('resolves')
+
+        if language_code is None:
+            instrumentation.record('missing')
+            missing_translation.send(
+                sender=type(instance), instance=instance, field=self.name, language=instance._language_code,
+            )
+        elif language_code != instance._language_code:
+            instrumentation.record('fallbacks')
+
+        return language_code, value
+
+
+class TranslationsDescriptor(object):
+    """
+    Installed on the ``translations`` field. Assigning the whole dict can't be
+    tracked key by key, so it makes the next save write the full column.
+    """
+
+    def __init__(self, field, descriptor=None):
+        self.field = field
+        self.attname = field.attname
+        self.descriptor = descriptor
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        try:
+            return instance.__dict__[self.attname]
+        except KeyError:
+            return self.descriptor.__get__(instance, cls)
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.attname] = value
+        instance._dirty_translations = None
+
+
+def contribute_translated_fields(model):
+    """
+    Replace the attributes of ``model``'s translatable fields with
+    ``TranslatedFieldDescriptor`` instances and the ``translations`` attribute
+    with a ``TranslationsDescriptor``.
+    """
+    descriptor = getattr(model, 'translations', None)
+
+    if not isinstance(descriptor, TranslationsDescriptor):
+        setattr(model, 'translations', TranslationsDescriptor(model._meta.get_field('translations'), descriptor))
+
+    for name in getattr(model._meta, 'translatable_fields', None) or ():
+        descriptor = getattr(model, name, None)
+
+        if isinstance(descriptor, TranslatedFieldDescriptor):
+            continue
+
+        field = model._meta.get_field(name)
+        descriptor_class = InstrumentedTranslatedFieldDescriptor if instrumentation.ENABLED else TranslatedFieldDescriptor
+        setattr(model, name, descriptor_class(field, descriptor))
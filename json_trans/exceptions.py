@@ -6,3 +6,10 @@ class NonTranslatableFieldError(Exception):
         self.fieldname = fieldname
         message = _('{} is not in translatable fields').format(fieldname)
         super(NonTranslatableFieldError, self).__init__(message)
+
+
+class InvalidCursorError(Exception):
+    def __init__(self, cursor):
+        self.cursor = cursor
+        message = _('Invalid pagination cursor')
+        super(InvalidCursorError, self).__init__(message)
@@ -0,0 +1,255 @@
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields.jsonb import JsonAdapter, KeyTransform
+from django.db.models import BooleanField, CharField, F, Func, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
+
+from .storage import is_table_storage, translation_table
+
+
+class TranslationPath(Func):
+    """
+    `translations #>> '{language_code,key,...}'`, the expression the indexes
+    created by `json_trans_indexes` are built on. Filters, orderings and
+    projections of translated fields all use it so they can use the indexes.
+    """
+
+    def __init__(self, language_code, *keys, **extra):
+        self.path = '{%s}' % ','.join((language_code,) + keys)
+        extra.setdefault('output_field', TextField())
+        super(TranslationPath, self).__init__(F('translations'), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        return '(%s #>> %%s)' % lhs, params + [self.path]
+
+
+class TranslationRowPath(Func):
+    """
+    The table storage version of `TranslationPath`, reading the object's row
+    of `language_code` in the translation table of `model`:
+    `(SELECT data #>> '{key,...}' FROM <table> WHERE master_id = pk AND language_code = ...)`.
+    """
+
+    def __init__(self, model, language_code, *keys, **extra):
+        self.table = translation_table(model)
+        self.language_code = language_code
+        self.path = '{%s}' % ','.join(keys)
+        extra.setdefault('output_field', TextField())
+        super(TranslationRowPath, self).__init__(F('pk'), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        pk, params = compiler.compile(self.source_expressions[0])
+        sql = '(SELECT data #>> %%s FROM %s WHERE master_id = %s AND language_code = %%s)' % (
+            connection.ops.quote_name(self.table), pk,
+        )
+        return sql, [self.path] + params + [self.language_code]
+
+
+class StoredTranslations(Func):
+    """
+    The `translations` dict of a table stored model, limited to
+    `language_codes`: `(SELECT jsonb_object_agg(language_code, data) FROM <table> ...)`.
+    """
+
+    def __init__(self, model, language_codes, **extra):
+        self.table = translation_table(model)
+        self.language_codes = list(language_codes)
+        extra.setdefault('output_field', JSONField())
+        super(StoredTranslations, self).__init__(F('pk'), **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        pk, params = compiler.compile(self.source_expressions[0])
+        sql = (
+            "(SELECT COALESCE(jsonb_object_agg(language_code, data), '{}') FROM %s "
+            "WHERE master_id = %s AND language_code = ANY(%%s))"
+        ) % (connection.ops.quote_name(self.table), pk)
+        return sql, params + [self.language_codes]
+
+
+def translation_path(model, language_code, field_name):
+    """
+    Returns the `TranslationPath` or `TranslationRowPath` of `field_name`,
+    depending on the storage of `model`.
+    """
+    if is_table_storage(model):
+        return TranslationRowPath(model, language_code, field_name)
+
+    return TranslationPath(language_code, field_name)
+
+
+def translated_field(model, field_name, language_codes):
+    """
+    Returns an expression selecting `field_name` from the `translations`
+    column, i.e. `translations #>> '{language_code,field_name}'`.
+    `language_codes` is a language code or a fallback chain, chains select
+    the first non empty value with `COALESCE()`, `LANGUAGE_CODE` standing for
+    the base column.
+    """
+    if isinstance(language_codes, str):
+        language_codes = (language_codes,)
+
+    field = model._meta.get_field(field_name)
+    cast = not isinstance(field, (CharField, TextField))
+
+    if len(language_codes) == 1:
+        expression = translation_path(model, language_codes[0], field_name)
+        return Cast(expression, output_field=field) if cast else expression
+
+    expressions = []
+
+    for code in language_codes:
+        if code == settings.LANGUAGE_CODE:
+            expressions.append(F(field_name))
+            break
+
+        expression = Func(translation_path(model, code, field_name), Value(''), function='NULLIF', output_field=TextField())
+        expressions.append(Cast(expression, output_field=field) if cast else expression)
+
+    return Coalesce(*expressions, output_field=field)
+
+
+def translated_field_sql(model, connection, field_name, language_codes):
+    """
+    Returns the SQL of `translated_field()`, for expression indexes.
+    """
+    if isinstance(language_codes, str):
+        language_codes = (language_codes,)
+
+    field = model._meta.get_field(field_name)
+    cast = not isinstance(field, (CharField, TextField))
+    parts = []
+
+    for code in language_codes:
+        if code == settings.LANGUAGE_CODE:
+            parts.append(connection.ops.quote_name(field.column))
+            break
+
+        sql = "(translations #>> '{%s,%s}')" % (code, field_name)
+
+        if len(language_codes) > 1:
+            sql = "NULLIF(%s, '')" % sql
+
+        parts.append('(%s)::%s' % (sql, field.cast_db_type(connection)) if cast else sql)
+
+    return parts[0] if len(parts) == 1 else 'COALESCE(%s)' % ', '.join(parts)
+
+
+def merged_translations(translations, language_codes, encoder=None):
+    """
+    Returns an expression for updating the `translations` column from a
+    partially loaded `translations` dict. Languages in `language_codes` (the
+    loaded ones) are replaced, other languages of the dict are merged into the
+    stored ones and the rest of the column is left untouched.
+    """
+    loaded = {code: value for code, value in translations.items() if code in language_codes}
+
+    sql = "(COALESCE(translations, '{}'::jsonb) - %s::text[]) || %s::jsonb"
+    params = [list(language_codes), JsonAdapter(loaded, encoder=encoder)]
+
+    others = {code: value for code, value in translations.items() if code not in language_codes}
+
+    return RawSQL(*_merge_languages(sql, params, others, encoder))
+
+
+def updated_translations(translations, dirty, encoder=None):
+    """
+    Returns an expression for updating only the `dirty` keys
+    (`{language_code: field names}`) of the `translations` column with their
+    values in the `translations` dict.
+    """
+    changes = {
+        code: {name: (translations.get(code) or {}).get(name) for name in fields}
+        for code, fields in dirty.items()
+    }
+
+    return RawSQL(*_merge_languages("COALESCE(translations, '{}'::jsonb)", [], changes, encoder))
+
+
+def _merge_languages(sql, params, translations, encoder=None):
+    """
+    Wraps `sql` in `jsonb_set` calls merging every language of `translations`
+    into the stored one.
+    """
+    params = list(params)
+
+    for code, value in translations.items():
+        sql = "jsonb_set(%s, %%s, COALESCE(translations -> %%s, '{}'::jsonb) || %%s::jsonb)" % sql
+        params += [[code], code, JsonAdapter(value, encoder=encoder)]
+
+    return sql, params
+
+
+def sliced_translations(language_codes, model=None):
+    """
+    Returns an expression selecting only `language_codes` of the
+    `translations` column, i.e.
+    `jsonb_build_object('code', translations -> 'code', ...)`, or of the
+    translation table of a table stored `model`. Missing languages are null,
+    not stripped as jsonb_strip_nulls() would strip the null fields too.
+    """
+    if model is not None and is_table_storage(model):
+        return StoredTranslations(model, language_codes)
+
+    expressions = []
+
+    for code in language_codes:
+        expressions += [Value(code), KeyTransform(code, 'translations')]
+
+    return Func(*expressions, function='jsonb_build_object', output_field=JSONField())
+
+
+class FileURL(Func):
+    """
+    The URL of a stored file name, `prefix || name`, NULL for empty names.
+    Names already starting with `prefix` (URLs stored by older versions)
+    are kept as they are.
+    """
+
+    def __init__(self, expression, prefix, **extra):
+        self.prefix = prefix
+        extra.setdefault('output_field', TextField())
+        super(FileURL, self).__init__(expression, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        sql = "CASE WHEN COALESCE({0}, '') = '' THEN NULL WHEN left({0}, %s) = %s THEN {0} ELSE %s || {0} END".format(sql)
+        return sql, params * 2 + [len(self.prefix), self.prefix] + params + [self.prefix] + params
+
+
+def json_object(expressions):
+    """
+    Returns `jsonb_build_object(key, expression, ...)::text` of the
+    `{key: expression}` mapping.
+    """
+    arguments = []
+
+    for key, expression in expressions.items():
+        arguments += [Value(key, output_field=TextField()), expression]
+
+    return Cast(Func(*arguments, function='jsonb_build_object', output_field=JSONField()), TextField())
+
+
+class RowCompare(Func):
+    """
+    `(expression, ...) > (value, ...)` (`<` with `descending`), the row value
+    comparison of keyset pagination. A btree index on the first expression
+    can serve it.
+    """
+
+    def __init__(self, expressions, values, descending=False, **extra):
+        self.operator = '<' if descending else '>'
+        extra.setdefault('output_field', BooleanField())
+        super(RowCompare, self).__init__(*expressions, *[Value(value) for value in values], **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        parts, params = [], []
+
+        for expression in self.source_expressions:
+            sql, expression_params = compiler.compile(expression)
+            parts.append(sql)
+            params += expression_params
+
+        count = len(parts) // 2
+        return '(%s) %s (%s)' % (', '.join(parts[:count]), self.operator, ', '.join(parts[count:])), params
@@ -0,0 +1,61 @@
+"""
+Fallback chains of the translated fields.
+
+`settings.JSON_TRANS_FALLBACKS` maps a language code to the languages to try
+when a field isn't translated to it, e.g. `{'pt-br': ['pt']}`. With
+`settings.JSON_TRANS_FALLBACK` (or `fallback = True` on a model) every chain
+ends with `LANGUAGE_CODE`, i.e. the base columns. A field is missing when its
+key is absent, None or ''.
+
+The chains are built once at import, `TranslatedFieldDescriptor` walks them
+in Python and `translated_field()` turns them into a `COALESCE()`.
+"""
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+LANGUAGES = OrderedDict(settings.LANGUAGES)
+LANGUAGE_CODE = settings.LANGUAGE_CODE
+FALLBACK = getattr(settings, 'JSON_TRANS_FALLBACK', False)
+FALLBACKS = getattr(settings, 'JSON_TRANS_FALLBACKS', {})
+
+
+def _build_chains(fallback):
+    chains = {}
+
+    for code in LANGUAGES:
+        chain = [code]
+
+        for fallback_code in FALLBACKS.get(code, ()):
+            if fallback_code not in LANGUAGES:
+                raise ImproperlyConfigured(
+                    'JSON_TRANS_FALLBACKS[%r] contains %r which is not in settings.LANGUAGES.' % (code, fallback_code)
+                )
+            if fallback_code not in chain:
+                chain.append(fallback_code)
+
+        if fallback and LANGUAGE_CODE not in chain:
+            chain.append(LANGUAGE_CODE)
+
+        if LANGUAGE_CODE in chain:
+            # The base columns always have a value, nothing after them is used.
+            chain = chain[:chain.index(LANGUAGE_CODE) + 1]
+
+        chains[code] = tuple(chain)
+
+    return chains
+
+
+FALLBACK_CHAINS = {False: _build_chains(False), True: _build_chains(True)}
+
+
+def get_fallback_chain(language_code, fallback=FALLBACK):
+    """
+    Returns the languages `language_code` resolves to, in order and starting
+    with `language_code` itself.
+    """
+    try:
+        return FALLBACK_CHAINS[bool(fallback)][language_code]
+    except KeyError:
+        return (language_code,)
@@ -0,0 +1,91 @@
+"""
+Storage of the files assigned to translated file and image fields.
+
+Files are written to the field's storage under
+`JSON_TRANS_UPLOAD_TO/<sha256 of the content><extension>`, so the same file
+uploaded for several languages (or objects) is stored once. Contents are
+hashed and written chunk by chunk, `TemporaryUploadedFile`s are moved by
+the storage rather than read in memory.
+
+With `JSON_TRANS_FILE_WORKERS` set to a number of threads, writes run in a
+thread pool and `TranslatableModel.save()` waits for them before saving.
+"""
+import hashlib
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import File
+from django.db.models.fields.files import FieldFile
+
+UPLOAD_TO = getattr(settings, 'JSON_TRANS_UPLOAD_TO', 'uploads')
+FILE_WORKERS = getattr(settings, 'JSON_TRANS_FILE_WORKERS', 0)
+
+_executor = None
+
+
+def is_upload(value):
+    """
+    Returns whether `value` is a new file (e.g. an `UploadedFile` or a
+    `ContentFile`) rather than a stored one.
+    """
+    return isinstance(value, File) and not isinstance(value, FieldFile)
+
+
+def content_name(content):
+    """
+    Returns the storage name of `content`, derived from its sha256 digest.
+    """
+    digest = hashlib.sha256()
+
+    for chunk in content.chunks():
+        digest.update(chunk)
+
+    content.seek(0)
+    extension = os.path.splitext(content.name or '')[1].lower()
+    return posixpath.join(UPLOAD_TO, digest.hexdigest() + extension)
+
+
+def write(storage, name, content):
+    """
+    Returns the name `content` is stored under, the one given by the storage
+    if it had to pick another (e.g. two writes of the same content racing).
+    """
+    if not storage.exists(name):
+        name = storage.save(name, content)
+
+    return name
+
+
+def store(field, content):
+    """
+    Stores `content` for the translated `field` and returns `(name, future)`,
+    `future` being None unless the write was handed to the thread pool. The
+    result of `future` is the stored name, which replaces `name`.
+    """
+    global _executor
+
+    name = content_name(content)
+
+    if not FILE_WORKERS:
+        return write(field.storage, name, content), None
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=FILE_WORKERS, thread_name_prefix='json_trans_files')
+
+    return name, _executor.submit(write, field.storage, name, content)
+
+
+def stored_name(storage, value):
+    """
+    Returns the storage name of a translated file value. Older versions
+    stored URLs, their `base_url` is stripped so `FieldFile.url` gives them
+    back unchanged.
+    """
+    base_url = getattr(storage, 'base_url', None)
+
+    if value and base_url and value.startswith(base_url):
+        return value[len(base_url):]
+
+    return value
@@ -4,11 +4,17 @@ from collections import OrderedDict
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.forms import ModelForm
-from django.forms.models import InlineForeignKeyField
+from django.forms.models import InlineForeignKeyField, ModelFormMetaclass
+from django.utils.functional import lazy
+from django.utils.text import format_lazy
 from django.utils.translation import get_language
 
 LANGUAGES = OrderedDict(settings.LANGUAGES)
 DEFAULT_LANGUAGE_CODE = settings.LANGUAGE_CODE
+TRANSLATION_SEPARATOR = '__trans__'
+
+# Language names are usually lazy, labels are made once per form class.
+upper_lazy = lazy(lambda value: str(value).upper(), str)
 
 
 def construct_instance(form, instance, fields=None, exclude=None, translatable_fields=None, lang=DEFAULT_LANGUAGE_CODE):
@@ -38,7 +44,8 @@ def construct_instance(form, instance, fields=None, exclude=None, translatable_f
         # Defer saving file-type fields until after the other fields, so a
         # callable upload_to can use the values from other fields.
         if isinstance(f, models.FileField):
-            file_field_list.append(f)
+            if f.attname not in translatable_fields:
+                file_field_list.append(f)
         else:
             if f.attname not in translatable_fields:
                 f.save_form_data(instance, cleaned_data[f.name])
@@ -49,37 +56,82 @@ def construct_instance(form, instance, fields=None, exclude=None, translatable_f
     return instance
 
 
+def translation_field_name(field_name, language_code):
+    """
+    Returns the name of the form field of `field_name` in `language_code`.
+    """
+    return f'{field_name}{TRANSLATION_SEPARATOR}{language_code.replace("-", "_")}'
+
+
+def translation_form_fields(base_fields, model):
+    """
+    Returns `base_fields` with a copy of every translatable field per non
+    default language, and the `(name, field_name, language_code)` of the copies.
+    """
+    fields = OrderedDict(base_fields)
+    translation_fields = []
+
+    for name, field in base_fields.items():
+        if name not in model._meta.translatable_fields:
+            continue
+
+        for code, lang in LANGUAGES.items():
+            if code != DEFAULT_LANGUAGE_CODE:
+                new_field = copy.deepcopy(field)
+                new_field.required = False
+                new_field.name = translation_field_name(name, code)
+                new_field.label = format_lazy('{} ({})', field.label, upper_lazy(lang))
+                new_field.widget.attrs['placeholder'] = name
+                translation_fields.append((new_field.name, name, code))
+                fields[new_field.name] = new_field
+
+        # Copied as declared fields are shared with the parent classes.
+        fields[name] = copy.deepcopy(field)
+        fields[name].label = format_lazy('{} ({})', field.label, upper_lazy(LANGUAGES.get(DEFAULT_LANGUAGE_CODE)))
+
+    return fields, tuple(translation_fields)
+
+
+class TranslatableModelFormMetaclass(ModelFormMetaclass):
+    """
+    Generates the per language fields of multi language forms once per form
+    class, instances get them from `base_fields` like any other field.
+    """
+
+    def __new__(mcs, name, bases, attrs):
+        meta = attrs.get('Meta')
+        fields = getattr(meta, 'fields', None)
+
+        if isinstance(fields, (list, tuple)) and any(TRANSLATION_SEPARATOR in f for f in fields):
+            # The admin passes the generated names back in Meta.fields.
+            attrs['Meta'] = type('Meta', (meta,), {'fields': [f for f in fields if TRANSLATION_SEPARATOR not in f]})
+
+        new_class = super().__new__(mcs, name, bases, attrs)
+        model = new_class._meta.model
+
+        if new_class._mode == 'multi' and model is not None and getattr(model._meta, 'translatable_fields', None):
+            new_class.base_fields, new_class._translation_fields = translation_form_fields(new_class.base_fields, model)
+        else:
+            new_class._translation_fields = ()
+
+        return new_class
+
+
 class TranslatableModelFormMixin(object):
     _mode = 'single'  # single or multi
+    # (form field name, model field name, language code) of the generated
+    # per language fields, see TranslatableModelFormMetaclass.
+    _translation_fields = ()
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.active_language = get_language()
         self.translatable_field_names = self._meta.model._meta.translatable_fields
-
-        self.translatable_fields = []
-
-        self.form_fields = copy.deepcopy(self.fields) or self._meta.model._meta.fields
-
-        for name, field in self.form_fields.items():
-            if name in self.translatable_field_names:
-                if self._mode == 'multi':
-                    for code, lang in LANGUAGES.items():
-                        if code != DEFAULT_LANGUAGE_CODE:
-                            new_field = copy.deepcopy(field)
-                            new_field.required = False
-                            new_field.name = f'{name}__trans__{code.replace("-", "_")}'
-                            new_field.label = f'{field.label} ({LANGUAGES.get(code).upper()})'
-                            new_field.widget.attrs['placeholder'] = name
-                            self.translatable_fields.append((new_field.name, new_field))
-
-                    self.fields[name].label += f' ({LANGUAGES.get(DEFAULT_LANGUAGE_CODE).upper()})'
-
-        self.fields.update(self.translatable_fields)
+        self.translatable_fields = [(name, self.fields[name]) for name, field_name, code in self._translation_fields]
 
     def get_translation_data(self):
         data = self.cleaned_data
-        return {key: data[key] for key in data if '__trans__' in key}
+        return {key: data[key] for key in data if TRANSLATION_SEPARATOR in key}
 
     def get_single_translation_data(self):
         data = self.cleaned_data
@@ -89,16 +141,18 @@ class TranslatableModelFormMixin(object):
 
         translatable_fields = self.get_translation_data() if self._mode == 'multi' else self.get_single_translation_data()
 
-        for name, data in translatable_fields.items():
-            if self._mode == 'multi':
-                splitted_name = name.split('__trans__')
-                lang_code = splitted_name[-1]
-                field_name = splitted_name[0]
+        if self._mode == 'multi':
+            translations = {}
 
-                self.instance.translate(lang_code, **{field_name: data})
+            for name, field_name, code in self._translation_fields:
+                if name in translatable_fields:
+                    translations.setdefault(code, {})[field_name] = translatable_fields[name]
 
-            else:
-                self.instance.translate(self.active_language, **{name: data})
+            for code, values in translations.items():
+                self.instance.translate(code, **values)
+
+        elif translatable_fields:
+            self.instance.translate(self.active_language, **translatable_fields)
 
         opts = self._meta
 
@@ -123,7 +177,7 @@ class TranslatableModelFormMixin(object):
             self.validate_unique()
 
 
-class TranslatableModelForm(TranslatableModelFormMixin, ModelForm):
+class TranslatableModelForm(TranslatableModelFormMixin, ModelForm, metaclass=TranslatableModelFormMetaclass):
 
     def __init__(self, *args, **kwargs):
         instance = kwargs.get('instance')
@@ -140,19 +194,13 @@ class TranslatableModelForm(TranslatableModelFormMixin, ModelForm):
 
     def set_translation_fields(self, instance):
         result = {}
-        translations = instance.translations
+        translations = instance.translations or {}
 
-        field_names = self._meta.fields
+        for name, field_name, code in self._translation_fields:
+            values = translations.get(code)
 
-        if self._mode == 'multi':
-            for field_name in field_names:
-                if field_name in self.translatable_field_names:
-                    for lang, lang_code in LANGUAGES.items():
-                        try:
-                            result[f'{field_name}__trans__{lang_code}'] = translations.get(lang_code).get(field_name)
-                        except AttributeError:
-                            # result[f'{field_name}__{lang_code}'] = None
-                            pass
+            if values and field_name in values:
+                result[name] = values[field_name]
 
         return result
 
@@ -0,0 +1,114 @@
+import hashlib
+from collections import OrderedDict
+
+from django.conf import settings
+
+from .expressions import translated_field_sql
+from .fallback import FALLBACK, get_fallback_chain
+from .search import search_fields, search_vector_sql
+from .storage import TABLE, get_storage
+
+LANGUAGES = OrderedDict(settings.LANGUAGES)
+LANGUAGE_CODE = settings.LANGUAGE_CODE
+MAX_NAME_LENGTH = 63  # PostgreSQL's NAMEDATALEN - 1
+INDEX_SUFFIX = '_jt'
+
+
+def index_name(model, *parts):
+    """
+    Returns a deterministic index name for `model`, shortened with a digest
+    when it exceeds the PostgreSQL identifier length. Names always end with
+    `INDEX_SUFFIX` so stale indexes can be found.
+    """
+    name = '_'.join((model._meta.db_table,) + parts).replace('-', '_').lower()
+
+    if len(name) + len(INDEX_SUFFIX) > MAX_NAME_LENGTH:
+        digest = hashlib.md5(name.encode()).hexdigest()[:8]
+        name = '%s_%s' % (name[:MAX_NAME_LENGTH - len(INDEX_SUFFIX) - 9], digest)
+
+    return name + INDEX_SUFFIX
+
+
+def translation_indexes(model, fields=None, languages=None, trigram=False, search=False, connection=None,
+                        storage=None, fallback_chains=None):
+    """
+    Returns `(name, method, expression)` of the indexes matching the queries
+    of `TranslationQuerySet`:
+        - a GIN `jsonb_path_ops` index for `language()`'s containment filter,
+        - a btree index on `translations #>> '{lang,field}'` per non default
+          language and translatable field, for `filter()`, `order_by_json_path()`
+          and projections. Languages with a fallback chain are indexed on the
+          chain's `COALESCE()` instead, named after the chain,
+        - with `trigram`, a GIN `gin_trgm_ops` index on the `UPPER()` of the same
+          expression, for `icontains`, `istartswith` and `iexact` filters,
+        - with `search`, a GIN index per language on the `to_tsvector()` of the
+          text translatable fields, for `search()`.
+    `fields` defaults to the model's translatable fields, `languages` to
+    `settings.LANGUAGES`, `storage` to the model's and `fallback_chains`
+    (`{language: chain}`) to the chains of the model's `fallback`. Table stored
+    models have none, their translation table is indexed on
+    `(master_id, language_code)`.
+    """
+    if (storage or get_storage(model)) == TABLE:
+        return []
+
+    all_languages = list(languages or LANGUAGES)
+    languages = [code for code in all_languages if code != LANGUAGE_CODE]
+
+    if fallback_chains is None:
+        fallback = getattr(model, 'fallback', FALLBACK)
+        fallback_chains = {code: get_fallback_chain(code, fallback) for code in all_languages}
+
+    chains = {code: tuple(fallback_chains.get(code, (code,))) for code in all_languages}
+    indexes = [(index_name(model, 'translations', 'gin'), 'gin', 'translations jsonb_path_ops')]
+
+    for code in languages:
+        chain = chains[code]
+
+        for field_name in fields or model._meta.translatable_fields:
+            expression = translated_field_sql(model, connection, field_name, chain)
+            indexes.append((index_name(model, field_name, *chain), 'btree', expression))
+
+            if trigram:
+                indexes.append((
+                    index_name(model, field_name, *chain + ('trgm',)), 'gin', 'UPPER(%s) gin_trgm_ops' % expression,
+                ))
+
+    if search:
+        text_fields = search_fields(model, fields)
+
+        for code in all_languages:
+            if text_fields:
+                expression = search_vector_sql(model, connection, text_fields, chains[code])
+                indexes.append((index_name(model, 'search', code), 'gin', expression))
+
+    return indexes
+
+
+def create_index_sql(model, connection, name, method, expression, concurrently=False):
+    return 'CREATE INDEX %sIF NOT EXISTS %s ON %s USING %s (%s)' % (
+        'CONCURRENTLY ' if concurrently else '',
+        connection.ops.quote_name(name),
+        connection.ops.quote_name(model._meta.db_table),
+        method,
+        expression,
+    )
+
+
+def drop_index_sql(connection, name, concurrently=False):
+    return 'DROP INDEX %sIF EXISTS %s' % (
+        'CONCURRENTLY ' if concurrently else '',
+        connection.ops.quote_name(name),
+    )
+
+
+def existing_indexes(model, connection):
+    """
+    Returns the names of the indexes of `model`'s table created by json_trans.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexname LIKE %s",
+            [model._meta.db_table, '%%\\%s' % INDEX_SUFFIX],
+        )
+        return {row[0] for row in cursor.fetchall()}
@@ -0,0 +1,126 @@
+"""
+Opt-in instrumentation of translation resolution, enabled with
+`settings.JSON_TRANS_INSTRUMENTATION`. When disabled nothing is counted:
+translatable fields get the plain descriptor and querysets skip the timers.
+
+Counted events:
+    - reads: translatable attribute reads (timed as `read`),
+    - resolves: reads that had to look the value up in `translations`,
+    - fallbacks: resolves answered by a later language of the fallback chain,
+    - missing: resolves finding no value at all, also sent as the
+      `json_trans.signals.missing_translation` signal,
+    - activations: objects given their language by a queryset (`activation`),
+    - filters: lookups `TranslationQuerySet.filter()` rewrote to JSONB
+      expressions (`filter`),
+    - queries: database queries, only while collecting with `queries=True`
+      (`query`).
+
+`stats` holds the totals of the process, `collect()` gathers the events of a
+block of code and `TranslationStatsMiddleware` those of each request.
+"""
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
+    ContextVar = None
+
+ENABLED = getattr(settings, 'JSON_TRANS_INSTRUMENTATION', False)
+COUNTERS = ('reads', 'resolves', 'fallbacks', 'missing', 'activations', 'filters', 'queries')
+TIMERS = ('read', 'activation', 'filter', 'query')
+
+
+class TranslationStats(object):
+    """
+    Event counts and durations in seconds.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.times = dict.fromkeys(TIMERS, 0.0)
+
+    def add(self, counter, count=1, timer=None, duration=0.0):
+        self.counts[counter] += count
+
+        if timer is not None:
+            self.times[timer] += duration
+
+    def as_dict(self):
+        result = dict(self.counts)
+        result.update(('%s_time' % name, duration) for name, duration in self.times.items())
+        return result
+
+    def __repr__(self):
+        return '<TranslationStats %s>' % ' '.join('%s=%s' % item for item in sorted(self.as_dict().items()))
+
+
+stats = TranslationStats()
+
+if ContextVar is not None:
+    _collectors = ContextVar('json_trans_collectors', default=())
+else:
+    _collectors = None
+
+
+def get_collectors():
+    return _collectors.get() if _collectors is not None else ()
+
+
+def record(counter, count=1, timer=None, duration=0.0):
+    stats.add(counter, count, timer, duration)
+
+    for collector in get_collectors():
+        collector.add(counter, count, timer, duration)
+
+
+def _time_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record('queries', 1, 'query', time.perf_counter() - start)
+
+
+@contextmanager
+def collect(queries=False, using=None):
+    """
+    Yields a `TranslationStats` of the events in the block. With `queries`,
+    queries of the `using` connections (all by default) of the current thread
+    are counted and timed too.
+    Usage example:
+        with collect(queries=True) as block_stats:
+            render_page()
+        print(block_stats.as_dict())
+    """
+    collector = TranslationStats()
+
+    if _collectors is None:
+        yield collector
+        return
+
+    token = _collectors.set(get_collectors() + (collector,))
+
+    try:
+        with ExitStack() as stack:
+            if queries:
+                for alias in using or connections:
+                    stack.enter_context(connections[alias].execute_wrapper(_time_query))
+            yield collector
+    finally:
+        _collectors.reset(token)
+
+
+def activate(obj, language_code, is_default):
+    """
+    `obj._activate_language()` as called by `TranslationModelIterable`, timed.
+    """
+    start = time.perf_counter()
+    obj._activate_language(language_code, is_default)
+    record('activations', 1, 'activation', time.perf_counter() - start)
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from json_trans.benchmarks import BENCHMARKS, compare, load_baseline, run_benchmarks, save_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks json_trans attribute access, iteration, filtering, ordering, translate() and save() and "
+        "form construction, optionally comparing the results with a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Benchmarks to run: %s.' % ', '.join(BENCHMARKS))
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--no-database', dest='with_database', action='store_false',
+                            help='Only run the in memory benchmarks.')
+        parser.add_argument('--rows', nargs='+', type=int, default=[1000, 10000])
+        parser.add_argument('--languages', nargs='+', type=int, default=[2, 10],
+                            help='Number of languages in the translations column.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--indexes', action='store_true', help='Create the json_trans_indexes indexes first.')
+        parser.add_argument('--save-baseline', metavar='PATH')
+        parser.add_argument('--compare', metavar='PATH', help='Baseline to compare the results with.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Slowdown ratio reported as a regression, 0.2 by default.')
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(BENCHMARKS)
+        if unknown:
+            raise CommandError('Unknown benchmarks: %s' % ', '.join(sorted(unknown)))
+
+        baseline = load_baseline(options['compare']) if options['compare'] else {}
+
+        def output(name, value):
+            if options['verbosity'] > 1:
+                self.stderr.write('%s: %.3f us/op' % (name, value))
+
+        results = run_benchmarks(options, options['names'], output)
+        rows = compare(results, baseline, options['threshold'])
+
+        for name, value, base, change, regressed in rows:
+            line = '%-60s %12.3f us/op' % (name, value)
+            if change is not None:
+                line += '  %12.3f  %+7.1f%%' % (base, change * 100)
+            if regressed:
+                line += '  REGRESSION'
+            self.stdout.write(line)
+
+        if options['save_baseline']:
+            save_baseline(options['save_baseline'], results)
+
+        regressions = [row[0] for row in rows if row[4]]
+        if regressions:
+            raise CommandError('%d benchmark(s) slower than the baseline by more than %d%%: %s' % (
+                len(regressions), options['threshold'] * 100, ', '.join(regressions),
+            ))
@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from json_trans.coverage import compute_coverage, get_coverage, is_enabled, refresh
+from json_trans.utils import get_translatable_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints the number of objects with each translatable field filled per language, "
+        "computed in SQL or read from the coverage summary table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', help='app_label or app_label.ModelName, all models by default.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--languages', nargs='+', help='Language codes, settings.LANGUAGES by default.')
+        parser.add_argument('--refresh', action='store_true',
+                            help='Recompute the summary table, needs settings.JSON_TRANS_COVERAGE.')
+        parser.add_argument('--live', action='store_true', help='Compute in SQL even if the summary table is enabled.')
+        parser.add_argument('--json', action='store_true', help='Output JSON rows.')
+        parser.add_argument('--fail-under', type=float, metavar='RATIO',
+                            help='Fail if a field is translated in less than RATIO (0-1) of the objects.')
+
+    def handle(self, *args, **options):
+        if options['refresh'] and not is_enabled():
+            raise CommandError('Set JSON_TRANS_COVERAGE to keep a coverage summary table.')
+
+        try:
+            models = get_translatable_models(options['labels'])
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        rows = []
+
+        for model in models:
+            if options['refresh']:
+                refresh(model, options['database'])
+
+            if options['live']:
+                rows += compute_coverage(model, options['languages'], using=options['database'])
+            else:
+                rows += get_coverage(model, options['languages'], using=options['database'])
+
+        if options['json']:
+            self.stdout.write(json.dumps([dict(row._asdict(), ratio=row.ratio) for row in rows], indent=2))
+        else:
+            for row in rows:
+                self.stdout.write('%-40s %-10s %-30s %8d / %-8d %6.1f%%' % (
+                    row.model, row.language, row.field, row.translated, row.total, row.ratio * 100,
+                ))
+
+        if options['fail_under'] is not None:
+            failing = [row for row in rows if row.ratio < options['fail_under']]
+            if failing:
+                raise CommandError('%d field(s) translated under %d%%: %s' % (
+                    len(failing), options['fail_under'] * 100,
+                    ', '.join('%s.%s [%s]' % (row.model, row.field, row.language) for row in failing),
+                ))
@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from json_trans.transfer import EXPORT_CHUNK_SIZE, FORMATS, export_records
+from json_trans.utils import get_translatable_models
+
+LANGUAGES = OrderedDict(settings.LANGUAGES)
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams the translations of TranslatableModels to JSONL, PO or XLIFF. PO and XLIFF files hold one "
+        "language, use an --output path containing {language} to export several."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', help='app_label or app_label.ModelName, all models by default.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--format', default='jsonl', choices=sorted(FORMATS))
+        parser.add_argument(
+            '--languages', nargs='+',
+            help='Language codes, every language of settings.LANGUAGES but the default one by default.',
+        )
+        parser.add_argument('--output', help='Output file, stdout by default. {language} is replaced by the language code.')
+        parser.add_argument('--after', help='Only export objects with a greater pk, to resume an export of a single model.')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+        parser.add_argument('--include-missing', action='store_true', help='Also export untranslated fields, empty.')
+
+    def handle(self, *args, **options):
+        try:
+            models = get_translatable_models(options['labels'])
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        languages = options['languages'] or [code for code in LANGUAGES if code != settings.LANGUAGE_CODE]
+        format_class = FORMATS[options['format']]
+        output = options['output']
+
+        if format_class is FORMATS['jsonl']:
+            groups = [(None, languages)]
+        elif len(languages) == 1 or (output and '{language}' in output):
+            groups = [(code, [code]) for code in languages]
+        else:
+            raise CommandError('%s files hold one language, pass one --languages code or a {language} --output path.'
+                               % options['format'])
+
+        for language_code, language_codes in groups:
+            if output:
+                stream = open(output.format(language=language_code), 'w', encoding='utf-8')
+            else:
+                stream = self.stdout
+
+            try:
+                self.export(format_class(stream, language_code), models, language_codes, options)
+            finally:
+                if output:
+                    stream.close()
+
+    def export(self, writer, models, language_codes, options):
+        writer.write_header()
+
+        for model in models:
+            count = 0
+            last_pk = None
+
+            for record in export_records(
+                model, language_codes, options['database'], options['after'],
+                options['chunk_size'], options['include_missing'],
+            ):
+                writer.write(record)
+                count += 1
+                last_pk = record.pk
+
+                if options['verbosity'] > 1 and count % options['chunk_size'] == 0:
+                    self.stderr.write('%s: %d records, last pk %s' % (model._meta.label, count, last_pk))
+
+            if options['verbosity'] > 0:
+                self.stderr.write('%s: exported %d records, last pk %s' % (model._meta.label, count, last_pk))
+
+        writer.write_footer()
@@ -0,0 +1,54 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from json_trans.exceptions import NonTranslatableFieldError
+from json_trans.transfer import FORMATS, IMPORT_BATCH_SIZE, import_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports translations exported by json_trans_export, merging them into the translations column in "
+        "batched transactions. The reported offset can be passed to --offset to resume an interrupted import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import, - for stdin.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--format', choices=sorted(FORMATS), help='Guessed from the file extension by default.')
+        parser.add_argument('--language', help='Language of the translations, read from the file by default.')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument('--offset', type=int, default=0, help='Number of records to skip.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        format_name = options['format'] or path.rsplit('.', 1)[-1]
+
+        if format_name not in FORMATS:
+            raise CommandError('Unknown format %s, use --format.' % format_name)
+
+        format_class = FORMATS[format_name]
+        binary = format_class is FORMATS['xliff']
+
+        if path == '-':
+            stream = sys.stdin.buffer if binary else sys.stdin
+        else:
+            stream = open(path, 'rb') if binary else open(path, encoding='utf-8')
+
+        def progress(offset):
+            if options['verbosity'] > 0:
+                self.stderr.write('committed up to offset %d' % offset)
+
+        try:
+            offset = import_records(
+                format_class.read(stream, options['language']), options['database'],
+                options['batch_size'], options['offset'], progress,
+            )
+        except (LookupError, ValueError, NonTranslatableFieldError) as e:
+            raise CommandError(str(e))
+        finally:
+            if path != '-':
+                stream.close()
+
+        self.stdout.write('Imported up to offset %d.' % offset)
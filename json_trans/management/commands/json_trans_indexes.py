@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from json_trans.indexes import create_index_sql, drop_index_sql, existing_indexes, translation_indexes
+from json_trans.utils import get_translatable_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the expression indexes used by translated filters and orderings for "
+        "every language in settings.LANGUAGES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', help='app_label or app_label.ModelName, all models by default.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--languages', nargs='+', help='Language codes, settings.LANGUAGES by default.')
+        parser.add_argument('--trigram', action='store_true', help='Also create pg_trgm indexes for icontains filters.')
+        parser.add_argument('--search', action='store_true', help='Also create full text search indexes.')
+        parser.add_argument('--concurrently', action='store_true', help='Create and drop indexes without locking writes.')
+        parser.add_argument('--drop', action='store_true', help='Drop every json_trans index instead.')
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='Also drop json_trans indexes not matching the other options, e.g. of removed languages.',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only print the SQL statements.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+
+        if connection.vendor != 'postgresql':
+            raise CommandError('json_trans indexes require PostgreSQL.')
+
+        try:
+            models = get_translatable_models(options['labels'])
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        for model in models:
+            existing = existing_indexes(model, connection)
+            statements = []
+
+            if options['drop']:
+                wanted = set()
+            else:
+                indexes = translation_indexes(
+                    model, languages=options['languages'], trigram=options['trigram'],
+                    search=options['search'], connection=connection,
+                )
+                wanted = {name for name, method, expression in indexes}
+
+                for name, method, expression in indexes:
+                    if name not in existing:
+                        statements.append(create_index_sql(
+                            model, connection, name, method, expression, options['concurrently'],
+                        ))
+
+            if options['drop'] or options['prune']:
+                for name in sorted(existing - wanted):
+                    statements.append(drop_index_sql(connection, name, options['concurrently']))
+
+            for sql in statements:
+                self.stdout.write(sql + ';')
+
+                if not options['dry_run']:
+                    # CONCURRENTLY can't run in a transaction, autocommit
+                    # runs every statement on its own.
+                    with connection.cursor() as cursor:
+                        cursor.execute(sql)
+
+            if options['verbosity'] > 1 or not statements:
+                self.stdout.write('%s: %d statement(s)' % (model._meta.label, len(statements)))
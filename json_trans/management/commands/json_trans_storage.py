@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from json_trans.cache import invalidate_model
+from json_trans.storage import STORAGES, get_storage, move_sql
+from json_trans.utils import get_translatable_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves translations between the translations column and the translation table, to the storage set "
+        "by Meta.translation_storage by default. The translation table has to be migrated: move to table "
+        "storage after switching the model to it, back to the column before switching away from it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', help='app_label or app_label.ModelName, all models by default.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--to', choices=STORAGES, help='Target storage, Meta.translation_storage by default.')
+        parser.add_argument('--dry-run', action='store_true', help='Only print the SQL statements.')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+
+        if connection.vendor != 'postgresql':
+            raise CommandError('json_trans storage requires PostgreSQL.')
+
+        try:
+            models = get_translatable_models(options['labels'])
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        for model in models:
+            storage = options['to'] or get_storage(model)
+            statements = move_sql(model, connection, storage)
+
+            for sql in statements:
+                self.stdout.write(sql + ';')
+
+            if options['dry_run']:
+                continue
+
+            with transaction.atomic(using=options['database']):
+                with connection.cursor() as cursor:
+                    for sql in statements:
+                        cursor.execute(sql)
+
+            invalidate_model(model)
+            self.stdout.write('%s: moved to %s storage' % (model._meta.label, storage))
@@ -1,14 +1,37 @@
+import hashlib
+import time
 from collections import OrderedDict
+from itertools import islice
 
 from django.conf import settings
-from django.db import models
-from django.db.models.expressions import RawSQL
+from django.contrib.postgres.fields.jsonb import JsonAdapter
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections, models, transaction
+from django.db.models.constants import LOOKUP_SEP
 from django.db.models.query import ModelIterable
+from django.db.models.sql.where import AND
+from django.utils import translation
 from django.utils.translation import get_language
 
+from . import cache as translation_cache
+from . import coverage as translation_coverage
+from . import instrumentation
+from . import storage as translation_storage
+from .exceptions import NonTranslatableFieldError
+from .expressions import (
+    FileURL, json_object, sliced_translations, translated_field, translation_path, updated_translations,
+)
+from .fallback import FALLBACK, get_fallback_chain
+from .pagination import keyset_page
+from .search import search_config, search_fields, search_vector
+from .utils import run_sync
+
 LANGUAGES = OrderedDict(settings.LANGUAGES)
 LANGUAGE_CODE = settings.LANGUAGE_CODE
-FALLBACK = False  # settings.FALLBACK
+BULK_TRANSLATE_BATCH_SIZE = 1000
+TRANSLATIONS_SLICE = '_translations_slice'
+JSON_OBJECT = '_json_object'
+JSON_MEDIA_URL = getattr(settings, 'JSON_TRANS_MEDIA_URL', None) or settings.MEDIA_URL
 
 
 class TranslationMixin(object):
@@ -29,16 +52,78 @@ class TranslationMixin(object):
         return language_code == LANGUAGE_CODE
 
 
+def activate(obj, language_code, is_default):
+    if instrumentation.ENABLED:
+        instrumentation.activate(obj, language_code, is_default)
+    else:
+        obj._activate_language(language_code, is_default)
+
+
+def related_instances(obj, seen):
+    """
+    Yields the instances cached on `obj` by `select_related()` and
+    `prefetch_related()`, recursively. Instances whose id is in `seen` are
+    skipped, yielded ones are added to it.
+    """
+    related = list(obj._state.fields_cache.values())
+
+    for cached in getattr(obj, '_prefetched_objects_cache', {}).values():
+        related.extend(getattr(cached, '_result_cache', None) or ())
+
+    for instance in related:
+        if instance is None or id(instance) in seen:
+            continue
+
+        seen.add(id(instance))
+        yield instance
+        yield from related_instances(instance, seen)
+
+
 class TranslationModelIterable(ModelIterable):
     def __iter__(self):
+        languages = self.queryset._translation_slice
+        # Resolved once for the whole queryset rather than per object.
+        language_code = self.queryset._language_code
+        is_default = self.queryset.is_default_language(language_code)
+        model = self.queryset.model
+
+        if languages is None and translation_storage.is_table_storage(model):
+            # Only the rows of the language and its fallback chain.
+            chain = get_fallback_chain(language_code, model.fallback) if language_code else ()
+            languages = tuple(code for code in chain if code != LANGUAGE_CODE)
+        # Objects joined by select_related() take the language of the
+        # queryset, the ones set from `_known_related_objects` keep theirs.
+        select_related = bool(self.queryset.query.select_related)
+        known = {id(rel_obj) for rel_objs in self.queryset._known_related_objects.values()
+                 for rel_obj in rel_objs.values()}
+
+        if languages is not None:
+            # Select the sliced languages in place of the full column.
+            self.queryset = self.queryset.defer('translations')
+            self.queryset.query.add_annotation(
+                sliced_translations(languages, model), TRANSLATIONS_SLICE, is_summary=False,
+            )
+
         for obj in super(TranslationModelIterable, self).__iter__():
-            if self.queryset._language_code:
-                obj.language(self.queryset._language_code)
+            if languages is not None:
+                # Not assigned through the descriptor, which would reset the tracked changes.
+                sliced = obj.__dict__.pop(TRANSLATIONS_SLICE) or {}
+                obj.__dict__['translations'] = {code: fields for code, fields in sliced.items() if fields is not None}
+                obj._loaded_languages = languages
+                obj.track_translations()
+            if language_code:
+                activate(obj, language_code, is_default)
+
+                if select_related:
+                    for related in related_instances(obj, {id(obj)} | known):
+                        if hasattr(related, '_activate_language'):
+                            activate(related, language_code, is_default)
             yield obj
 
 
 class TranslationQuerySet(models.QuerySet, TranslationMixin):
     _language_code = None
+    _translation_slice = None
 
     def __init__(self, model=None, query=None, using=None, hints=None):
         super(TranslationQuerySet, self).__init__(model, query, using, hints)
@@ -46,55 +131,585 @@ class TranslationQuerySet(models.QuerySet, TranslationMixin):
         self._language_code = self.get_language_code()
 
     def language_or_default(self, language_code=None):
-        language_code = self.get_language_code(language_code)
-        self._language_code = language_code
-        return self
+        clone = self._chain()
+        clone._language_code = self.get_language_code(language_code)
+        return clone
 
-    def language(self, language_code=None):
+    def language(self, language_code=None, slice=False, fallback_languages=()):
+        """
+        Sets the language of the queryset and excludes objects not translated
+        to it, unless the language falls back to others. With `slice` only
+        that language, its fallback chain and `fallback_languages` are loaded
+        from the `translations` column, saving the objects only updates the
+        loaded languages.
+        """
         language_code = self.get_language_code(language_code)
-        self._language_code = language_code
         results = self.language_or_default(language_code)
 
-        if self.is_default_language(language_code):
+        if slice:
+            languages = [language_code] if not self.is_default_language(language_code) else []
+            fallback_languages = get_fallback_chain(language_code, self.model.fallback)[1:] + tuple(fallback_languages)
+            languages += [
+                code for code in fallback_languages if code != LANGUAGE_CODE and code not in languages
+            ]
+            results._translation_slice = tuple(languages)
+
+        if self.is_default_language(language_code) or len(get_fallback_chain(language_code, self.model.fallback)) > 1:
+            # Untranslated objects resolve to the fallback languages.
             return results
 
-        return results.filter(translations__has_key=language_code)
+        return results.filter(translation_storage.translated_lookup(self.model, language_code))
 
     def _clone(self, *args, **kwargs):
         clone = super(TranslationQuerySet, self)._clone(*args, **kwargs)
         clone._language_code = self._language_code
+        clone._translation_slice = self._translation_slice
         return clone
 
+    def _prefetch_related_objects(self):
+        """
+        Runs the prefetch lookups in the language of the queryset: related
+        managers and `Prefetch()` querysets without a language of their own
+        load their objects in it. Objects loaded by plain managers (e.g. the
+        base manager used for foreign keys) are activated afterwards.
+        """
+        with translation.override(self._language_code):
+            super(TranslationQuerySet, self)._prefetch_related_objects()
+
+        if self.is_default_language(self._language_code):
+            return
+
+        seen = {id(obj) for obj in self._result_cache}
+
+        for obj in self._result_cache:
+            for related in related_instances(obj, seen):
+                # Created in the overridden language but never activated.
+                if getattr(related, '_language_code', None) == self._language_code and related._translated is None:
+                    activate(related, self._language_code, False)
+
     def filter(self, *args, **kwargs):
-        if not self.is_default_language(self._language_code):
-            for key, value in kwargs.items():
-                if key.split('__')[0] in self.model._meta.translatable_fields:
-                    del kwargs[key]
-                    key = 'translations__{}__{}'.format(self._language_code, key)
-                    kwargs[key] = value
+        if self.is_default_language(self._language_code):
+            return super(TranslationQuerySet, self).filter(*args, **kwargs)
+
+        translated = {}
+        for key in list(kwargs):
+            if key.split(LOOKUP_SEP)[0] in self.model._meta.translatable_fields:
+                translated[key] = kwargs.pop(key)
+
+        clone = super(TranslationQuerySet, self).filter(*args, **kwargs)
+        start = time.perf_counter() if instrumentation.ENABLED else None
+
+        for key, value in translated.items():
+            clone.query.where.add(clone._translated_lookup(key, value), AND)
+
+        if start is not None and translated:
+            instrumentation.record('filters', len(translated), 'filter', time.perf_counter() - start)
+
+        return clone
+
+    def _translated_lookup(self, key, value):
+        """
+        Builds the lookup for `key` (e.g. `title__icontains`) on the translated
+        expression of its field instead of on the base column.
+        """
+        field_name, *lookups = key.split(LOOKUP_SEP)
+        lhs = self.translated_expression(field_name).resolve_expression(self.query)
+        value = self.query.resolve_lookup_value(value, None, True)
+
+        return self.query.build_lookup(lookups or ['exact'], lhs, value)
+
+    def translated_expression(self, field_name, language_code=None):
+        """
+        Returns the expression selecting the translated value of `field_name`
+        in `language_code` (the queryset's language by default), falling back
+        along the language's fallback chain.
+        """
+        language_code = self.get_language_code(language_code or self._language_code)
+
+        if self.is_default_language(language_code):
+            return models.F(field_name)
+
+        return translated_field(self.model, field_name, get_fallback_chain(language_code, self.model.fallback))
+
+    def translated_annotate(self, language_code=None, **fields):
+        """
+        Annotates translated values of translatable fields under the given aliases.
+        Usage example:
+            MyModel.objects.language('tr-tr').translated_annotate(title_tr='title')
+        """
+        self._check_translatable_fields(fields.values())
+        annotations = {}
+
+        for alias, field_name in fields.items():
+            annotations[alias] = self.translated_expression(field_name, language_code)
+
+        return self.annotate(**annotations)
+
+    def _translated_projection(self, fields):
+        """
+        Returns a clone selecting the translated value of every translatable
+        field in `fields` under the field's own name, along with the fields to
+        select. Only meant for values() and values_list().
+        """
+        clone = self._chain()
+
+        if self.is_default_language(self._language_code):
+            return clone, fields
+
+        translatable_fields = self.model._meta.translatable_fields
+        fields = fields or tuple(f.attname for f in self.model._meta.concrete_fields)
+
+        for name in fields:
+            if name in translatable_fields:
+                # Query.add_annotation() skips the conflict check of annotate().
+                clone.query.add_annotation(self.translated_expression(name), name, is_summary=False)
+
+        return clone, fields
+
+    def values(self, *fields, **expressions):
+        clone, fields = self._translated_projection(fields)
+        return super(TranslationQuerySet, clone).values(*fields, **expressions)
+
+    def values_list(self, *fields, flat=False, named=False):
+        clone, fields = self._translated_projection(fields)
+        return super(TranslationQuerySet, clone).values_list(*fields, flat=flat, named=named)
+
+    def only(self, *fields):
+        # Translatable fields are read from `translations` in other languages,
+        # so load it with them instead of deferring it to a query per row.
+        if not self.is_default_language(self._language_code) and not translation_storage.is_table_storage(self.model):
+            translatable_fields = self.model._meta.translatable_fields
+
+            if any(f.split(LOOKUP_SEP)[0] in translatable_fields for f in fields):
+                fields += ('translations',)
+
+        return super(TranslationQuerySet, self).only(*fields)
+
+    def update(self, **kwargs):
+        if translation_coverage.is_enabled() and any(
+            name == 'translations' or name in self.model._meta.translatable_fields for name in kwargs
+        ):
+            # Updates the rows counted by the coverage summary, not the ones
+            # matching the filters once they're locked.
+            pks = list(self.values_list('pk', flat=True))
+
+            with translation_coverage.track(self.model, self.db, pks):
+                rows = self.model._base_manager.using(self.db).filter(pk__in=pks).update(**kwargs)
+        else:
+            rows = super(TranslationQuerySet, self).update(**kwargs)
+
+        translation_cache.invalidate_model(self.model)
+
+        return rows
+
+    def _check_translatable_fields(self, fields):
+        for name in fields:
+            if name not in self.model._meta.translatable_fields:
+                raise NonTranslatableFieldError(name)
+
+    def update_translation(self, language_code, **fields):
+        """
+        Translates `fields` of every object in the queryset with a single UPDATE,
+        other keys of the `translations` column are left untouched.
+        Usage example:
+            MyModel.objects.filter(is_active=True).update_translation('tr-tr', title='Başlık')
+        """
+        self._check_translatable_fields(fields)
+        language_code = self.get_language_code(language_code)
+
+        if self.is_default_language(language_code):
+            return self.update(**fields)
+
+        if translation_storage.is_table_storage(self.model):
+            pks = list(self.values_list('pk', flat=True)) if translation_coverage.is_enabled() else ()
+
+            with translation_coverage.track(self.model, self.db, pks):
+                rows = translation_storage.write_queryset(self, language_code, fields)
+
+            translation_cache.invalidate_model(self.model)
+            return rows
+
+        encoder = self.model._meta.get_field('translations').encoder
+        expression = updated_translations({language_code: fields}, {language_code: fields}, encoder)
+
+        return self.update(translations=expression)
+
+    def bulk_translate(self, objs, language_code, batch_size=None):
+        """
+        Translates many objects with one UPDATE ... FROM (VALUES ...) per batch.
+        `objs` is either a {pk: {field: value}} mapping or saved instances, whose
+        `language_code` translations (only the changed fields if tracked) are
+        written. Returns the number of updated rows.
+        Usage example:
+            MyModel.objects.bulk_translate({1: {'title': 'Başlık'}}, 'tr-tr')
+        """
+        language_code = self.get_language_code(language_code)
+        batch_size = batch_size or BULK_TRANSLATE_BATCH_SIZE
+
+        if isinstance(objs, dict):
+            rows = list(objs.items())
+        else:
+            objs = list(objs)
+            rows = [(obj.pk, self._pending_translation(obj, language_code)) for obj in objs]
+        rows = [(pk, fields) for pk, fields in rows if fields]
 
-        return super(TranslationQuerySet, self).filter(*args, **kwargs)
+        for pk, fields in rows:
+            self._check_translatable_fields(fields)
+
+        updated = 0
+
+        with transaction.atomic(using=self.db, savepoint=False), \
+                translation_coverage.track(self.model, self.db, [pk for pk, fields in rows]):
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i:i + batch_size]
+
+                if self.is_default_language(language_code):
+                    updated += self._bulk_update_base(batch)
+                else:
+                    updated += self._bulk_translate_batch(batch, language_code)
+
+        if not isinstance(objs, dict):
+            for obj in objs:
+                obj.track_translations(language_code)
+
+        translation_cache.invalidate_model(self.model)
+
+        return updated
+
+    def _pending_translation(self, obj, language_code):
+        if self.is_default_language(language_code):
+            # The base columns, not the values translated to the active language.
+            return {name: getattr(self.model, name).get_default(obj) for name in self.model._meta.translatable_fields}
+
+        translations = (obj.translations or {}).get(language_code) or {}
+
+        dirty = obj.get_dirty_translations()
+
+        if dirty is not None:
+            return {name: translations.get(name) for name in dirty.get(language_code, ())}
+
+        return translations
+
+    def _bulk_update_base(self, rows):
+        """
+        Updates the base columns of `rows` (`(pk, {field: value})`) with a
+        single UPDATE, a `CASE pk WHEN ...` per field.
+        """
+        opts = self.model._meta
+        updates = {}
+
+        for name in sorted({name for pk, fields in rows for name in fields}):
+            field = opts.get_field(name)
+            whens = [
+                models.When(pk=pk, then=fields[name] if hasattr(fields[name], 'resolve_expression') else models.Value(
+                    fields[name], output_field=field,
+                ))
+                for pk, fields in rows if name in fields
+            ]
+            updates[name] = models.Case(*whens, default=models.F(name), output_field=field)
+
+        return self.model._base_manager.using(self.db).filter(pk__in=[pk for pk, fields in rows]).update(**updates)
+
+    def _bulk_translate_batch(self, rows, language_code):
+        connection = connections[self.db]
+
+        if translation_storage.is_table_storage(self.model):
+            return translation_storage.write(
+                self.model, connection, [(pk, language_code, fields) for pk, fields in rows],
+            )
+
+        opts = self.model._meta
+        qn = connection.ops.quote_name
+
+        table = qn(opts.db_table)
+        column = '%s.%s' % (table, qn(opts.get_field('translations').column))
+        pk_column = '%s.%s' % (table, qn(opts.pk.column))
+        pk_type = opts.pk.rel_db_type(connection)
+        encoder = opts.get_field('translations').encoder
+
+        values = ', '.join(['(%%s::%s, %%s::jsonb)' % pk_type] * len(rows))
+        sql = (
+            "UPDATE {table} SET {translations} = jsonb_set(COALESCE({column}, '{{}}'::jsonb), %s, "
+            "COALESCE({column} -> %s, '{{}}'::jsonb) || v.translation) "
+            "FROM (VALUES {values}) AS v (pk, translation) WHERE {pk_column} = v.pk"
+        ).format(
+            table=table, translations=qn(opts.get_field('translations').column),
+            column=column, values=values, pk_column=pk_column,
+        )
+
+        params = [[language_code], language_code]
+        for pk, fields in rows:
+            params += [pk, JsonAdapter(fields, encoder=encoder)]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
+
+    def bulk_create(self, objs, *args, **kwargs):
+        table_storage = translation_storage.is_table_storage(self.model)
+        objs = list(objs)
+
+        if table_storage:
+            # The column stays NULL, translations are written to the table
+            # once the primary keys are known.
+            translations = [obj.translations for obj in objs]
+            for obj in objs:
+                obj.translations = None
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            try:
+                objs = super(TranslationQuerySet, self).bulk_create(objs, *args, **kwargs)
+            finally:
+                if table_storage:
+                    for obj, value in zip(objs, translations):
+                        obj.translations = value
+
+            if table_storage:
+                translation_storage.write(self.model, connections[self.db], [
+                    (obj.pk, code, fields)
+                    for obj in objs if obj.pk is not None
+                    for code, fields in (obj.translations or {}).items() if fields and code != LANGUAGE_CODE
+                ])
+
+            translation_coverage.record_create(self.model, self.db, [obj.pk for obj in objs if obj.pk is not None])
+
+        # Created rows hold the whole column, track further translations.
+        for obj in objs:
+            if obj.pk is not None:
+                obj.track_translations()
+
+        return objs
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Updates `fields` of `objs` with a `CASE pk WHEN ...` UPDATE per batch
+        and writes their translations with bulk_translate() rather than
+        overwriting the whole `translations` column.
+        """
+        objs = list(objs)
+        opts = self.model._meta
+        fields = [opts.get_field(name) for name in fields]
+        base_fields = [field for field in fields if field.name != 'translations']
+        batch_size = batch_size or BULK_TRANSLATE_BATCH_SIZE
+
+        if not fields:
+            raise ValueError('Field names must be given to bulk_update().')
+        if any(not field.concrete or field.many_to_many for field in fields):
+            raise ValueError('bulk_update() can only be used with concrete fields.')
+        if any(field.primary_key for field in fields):
+            raise ValueError('bulk_update() cannot be used with primary key fields.')
+        if any(obj.pk is None for obj in objs):
+            raise ValueError('All bulk_update() objects must have a primary key set.')
+
+        # Read the base columns, getattr() would get translatable fields
+        # translated to the active language.
+        rows = [
+            (obj.pk, {
+                field.attname: getattr(self.model, field.name).get_default(obj)
+                if field.name in opts.translatable_fields else getattr(obj, field.attname)
+                for field in base_fields
+            })
+            for obj in objs
+        ]
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            if base_fields:
+                translated = any(field.name in opts.translatable_fields for field in base_fields)
+
+                with translation_coverage.track(self.model, self.db, [pk for pk, values in rows] if translated else ()):
+                    for i in range(0, len(rows), batch_size):
+                        self._bulk_update_base(rows[i:i + batch_size])
+
+            if len(base_fields) < len(fields):
+                language_codes = set()
+
+                for obj in objs:
+                    dirty = obj.get_dirty_translations()
+                    language_codes.update(obj.translations or {} if dirty is None else dirty)
+
+                for language_code in language_codes:
+                    self.bulk_translate(objs, language_code, batch_size)
+
+    def search(self, query, fields=None, language_code=None, rank=True):
+        """
+        Full text search of `query` in the translated `fields` (every text
+        translatable field by default), with the text search configuration of
+        the language. With `rank` results are annotated with `search_rank`
+        and ordered by it. Matches the indexes created by
+        `manage.py json_trans_indexes --search`.
+        Usage example:
+            MyModel.objects.language('tr-tr').search('kırmızı elbise')
+        """
+        language_code = self.get_language_code(language_code or self._language_code)
+        fields = fields or search_fields(self.model)
+        self._check_translatable_fields(fields)
+
+        vector = search_vector(self, fields, language_code)
+        search_query = SearchQuery(query, config=search_config(language_code))
+
+        clone = self._chain()
+        lookup = clone.query.build_lookup(
+            ['exact'], vector.resolve_expression(clone.query), clone.query.resolve_lookup_value(search_query, None, True),
+        )
+        clone.query.where.add(lookup, AND)
+
+        if rank:
+            clone = clone.annotate(search_rank=SearchRank(vector, search_query)).order_by('-search_rank')
+
+        return clone
+
+    def json_path_expression(self, json_path, language_code=None):
+        """
+        Returns the expression `order_by_json_path()` sorts on, the one
+        indexed by `manage.py json_trans_indexes`.
+        """
+        language_code = (language_code or self._language_code or self.get_language_code(language_code))
+        chain = get_fallback_chain(language_code, self.model.fallback)
+
+        if json_path in self.model._meta.translatable_fields and len(chain) > 1:
+            # COALESCE() over the fallback chain, as in filter().
+            return translated_field(self.model, json_path, chain)
+
+        # translations #>> '{language_code,json_path}'
+        return translation_path(self.model, language_code, json_path)
 
     def order_by_json_path(self, json_path, language_code=None, order='asc'):
         """
         Orders a queryset by the value of the specified `json_path`.
         More about the `#>>` operator and the `json_path` arg syntax:
         https://www.postgresql.org/docs/current/static/functions-json.html
-        More about Raw SQL expressions:
-        https://docs.djangoproject.com/en/dev/ref/models/expressions/#raw-sql-expressions
+        The expression matches the indexes created by `manage.py json_trans_indexes`.
         Usage example:
             MyModel.objects.language('en_us').filter(is_active=True).order_by_json_path('title')
         """
-        language_code = (language_code or self._language_code or self.get_language_code(language_code))
-        json_path = '{%s,%s}' % (language_code, json_path)
-
-        # Our jsonb field is named `translations`.
-        raw_sql_expression = RawSQL("translations#>>%s", (json_path,))
+        expression = self.json_path_expression(json_path, language_code)
 
         if order == 'desc':
-            raw_sql_expression = raw_sql_expression.desc()
+            expression = expression.desc()
 
-        return self.order_by(raw_sql_expression)
+        return self.order_by(expression)
+
+    def keyset_page(self, json_path, cursor=None, size=20, language_code=None, order='asc'):
+        """
+        Returns a `KeysetPage` (`object_list`, `next_cursor`, `has_next`) of
+        `size` objects ordered like `order_by_json_path()` with the primary key
+        as tiebreaker. The page following `cursor` is found with a row value
+        comparison on the indexed expression rather than an OFFSET.
+        Usage example:
+            page = MyModel.objects.language('tr-tr').keyset_page('title', cursor=request.GET.get('cursor'))
+            page.object_list, page.next_cursor
+        """
+        return keyset_page(self, json_path, cursor, size, language_code, order)
+
+    def as_json(self, fields=None, language_code=None, chunk_size=2000):
+        """
+        Yields the objects as a JSON array in chunks of `chunk_size` encoded
+        objects. Each object is built by the database with
+        `jsonb_build_object()` from the values of `fields` (the concrete fields
+        by default) in `language_code`, fallback included. File fields are
+        turned into URLs with `JSON_TRANS_MEDIA_URL` (`MEDIA_URL` by default).
+        No model instance is created.
+        Usage example:
+            StreamingHttpResponse(MyModel.objects.language('tr-tr').as_json(['id', 'title']),
+                                  content_type='application/json')
+        """
+        opts = self.model._meta
+        fields = fields or [f.attname for f in opts.concrete_fields if f.name != 'translations']
+        expressions = OrderedDict()
+
+        for name in fields:
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+
+            if name in opts.translatable_fields:
+                expression = self.translated_expression(name, language_code)
+            else:
+                expression = models.F(name)
+
+            if isinstance(field, models.FileField):
+                expression = FileURL(expression, JSON_MEDIA_URL)
+
+            expressions[name] = expression
+
+        queryset = self._chain()
+        queryset.query.add_annotation(json_object(expressions), JSON_OBJECT, is_summary=False)
+        rows = queryset.values_list(JSON_OBJECT, flat=True).iterator(chunk_size)
+        separator = ''
+
+        yield b'['
+
+        for chunk in iter(lambda: list(islice(rows, chunk_size)), []):
+            yield (separator + ','.join(chunk)).encode()
+            separator = ','
+
+        yield b']'
+
+    def cached(self, key=None, timeout=translation_cache.CACHE_TIMEOUT):
+        """
+        Returns a clone holding the results of the queryset, read from and
+        stored to the `JSON_TRANS_CACHE` cache per language. Instances are
+        stored in their compact state: base fields plus the translations of
+        the queryset's language and its fallback chain. `key` defaults to a
+        digest of the SQL. The cached results of a model are dropped when one
+        of its objects is saved or it's updated at the queryset level.
+        Without `JSON_TRANS_CACHE` the results are simply fetched.
+        Usage example:
+            products = Product.objects.language('tr-tr').filter(category=category).cached('category:%s' % category.pk)
+        """
+        clone = self._chain()
+
+        if not translation_cache.is_enabled():
+            clone._fetch_all()
+            return clone
+
+        if key is None:
+            sql, params = clone.query.get_compiler(clone.db).as_sql()
+            # JsonAdapter params are compared by the value they adapt.
+            params = [getattr(param, 'adapted', param) for param in params]
+            lookups = [getattr(lookup, 'prefetch_to', lookup) for lookup in clone._prefetch_related_lookups]
+            key = hashlib.md5(repr((sql, params, clone._translation_slice, lookups)).encode()).hexdigest()
+
+        cache = translation_cache.get_cache()
+        key = translation_cache.results_key(self.model, cache, self._language_code, key)
+        cached = cache.get(key)
+
+        if cached is not None:
+            compact, rows = cached
+            clone._result_cache = [translation_cache.from_state(self.model, row) for row in rows] if compact else rows
+            clone._prefetch_done = True
+            return clone
+
+        clone._fetch_all()
+        compact = clone._iterable_class is TranslationModelIterable
+        rows = [obj.get_compact_state() for obj in clone._result_cache] if compact else clone._result_cache
+        cache.set(key, (compact, rows), timeout)
+
+        return clone
+
+    async def aiterator(self, chunk_size=2000):
+        """
+        Async version of `iterator()`: rows are fetched `chunk_size` at a time
+        outside of the event loop, with their language applied, and yielded
+        without a thread switch per object.
+        Usage example:
+            async for obj in MyModel.objects.language('tr-tr').aiterator():
+                ...
+        """
+        iterator = self.iterator(chunk_size)
+
+        while True:
+            chunk = await run_sync(list, islice(iterator, chunk_size))
+
+            if not chunk:
+                return
+
+            for obj in chunk:
+                yield obj
+
+    async def aget(self, *args, **kwargs):
+        return await run_sync(self.get, *args, **kwargs)
+
+    async def afirst(self):
+        return await run_sync(self.first)
 
 
 class TranslationManager(models.Manager, TranslationMixin):
@@ -102,6 +717,12 @@ class TranslationManager(models.Manager, TranslationMixin):
 
     def get_queryset(self, language_code=None):
         qs = self._queryset_class(self.model, using=self.db, hints=self._hints)
+
+        if not language_code:
+            # Related managers (e.g. `category.products`) follow the language
+            # of their instance.
+            language_code = getattr(getattr(self, 'instance', None), '_language_code', None)
+
         language_code = self.get_language_code(language_code)
         qs.language(language_code)
 
@@ -112,10 +733,13 @@ class TranslationManager(models.Manager, TranslationMixin):
 
         return self.get_queryset(language_code).language_or_default(language_code)
 
-    def language(self, language_code=None):
+    def language(self, language_code=None, slice=False, fallback_languages=()):
         language_code = self.get_language_code(language_code)
 
-        return self.get_queryset(language_code).language(language_code)
+        return self.get_queryset(language_code).language(language_code, slice, fallback_languages)
+
+    def json_path_expression(self, json_path, language_code=None):
+        return self.get_queryset(language_code).json_path_expression(json_path, language_code)
 
     def order_by_json_path(self, json_path, language_code=None, order='asc'):
         """
@@ -125,3 +749,36 @@ class TranslationManager(models.Manager, TranslationMixin):
             MyModel.objects.order_by_json_path('title', language_code='en_us', order='desc')
         """
         return self.get_queryset(language_code).order_by_json_path(json_path, language_code, order)
+
+    def keyset_page(self, json_path, cursor=None, size=20, language_code=None, order='asc'):
+        return self.get_queryset(language_code).keyset_page(json_path, cursor, size, language_code, order)
+
+    def translated_annotate(self, language_code=None, **fields):
+        return self.get_queryset(language_code).translated_annotate(language_code, **fields)
+
+    def update_translation(self, language_code, **fields):
+        return self.get_queryset(language_code).update_translation(language_code, **fields)
+
+    def bulk_translate(self, objs, language_code, batch_size=None):
+        return self.get_queryset(language_code).bulk_translate(objs, language_code, batch_size)
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        return self.get_queryset().bulk_update(objs, fields, batch_size)
+
+    def search(self, query, fields=None, language_code=None, rank=True):
+        return self.get_queryset(language_code).search(query, fields, language_code, rank)
+
+    def cached(self, key=None, timeout=translation_cache.CACHE_TIMEOUT):
+        return self.get_queryset().cached(key, timeout)
+
+    def aiterator(self, chunk_size=2000):
+        return self.get_queryset().aiterator(chunk_size)
+
+    async def aget(self, *args, **kwargs):
+        return await self.get_queryset().aget(*args, **kwargs)
+
+    async def afirst(self):
+        return await self.get_queryset().afirst()
+
+    def as_json(self, fields=None, language_code=None, chunk_size=2000):
+        return self.get_queryset(language_code).as_json(fields, language_code, chunk_size)
@@ -1,15 +1,132 @@
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.middleware.locale import LocaleMiddleware
 from django.utils import translation
 
+from . import instrumentation
+from .signals import request_stats
+from .utils import iscoroutinefunction, markcoroutinefunction
+
+logger = logging.getLogger('json_trans')
+
+LANGUAGES = OrderedDict((code.lower(), code) for code, name in settings.LANGUAGES)
+
+
+@lru_cache(maxsize=1000)
+def get_language_from_parameter(value):
+    """
+    Returns the code of `settings.LANGUAGES` matching `value` (e.g. `tr`,
+    `tr_TR` or `tr-tr`), or None.
+    """
+    value = value.strip().lower().replace('_', '-')
+
+    if value in LANGUAGES:
+        return LANGUAGES[value]
+
+    generic = value.split('-')[0]
+
+    for code, language_code in LANGUAGES.items():
+        if code == generic or code.startswith(generic + '-'):
+            return language_code
+
+    return None
+
 
 class QueryParameterLocaleMiddleware(LocaleMiddleware):
+    """
+    LocaleMiddleware activating the language of the `lang` query parameter.
+    Works as sync and as async middleware, under ASGI requests stay on the
+    event loop as resolving the language doesn't do any I/O.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super(QueryParameterLocaleMiddleware, self).__init__(get_response)
+
+        if iscoroutinefunction(get_response):
+            # Makes Django's handler await the middleware.
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        return super(QueryParameterLocaleMiddleware, self).__call__(request)
+
+    async def __acall__(self, request):
+        response = self.process_request(request)
+
+        if response is None:
+            response = await self.get_response(request)
+
+        return self.process_response(request, response)
+
     def process_request(self, request):
         """
         Overrides the parent class to try getting the language code from
         request parameter.
         """
-        if 'lang' in request.GET:
-            translation.activate(request.GET['lang'])
+        language_code = get_language_from_parameter(request.GET['lang']) if 'lang' in request.GET else None
+
+        if language_code:
+            translation.activate(language_code)
             request.LANGUAGE_CODE = translation.get_language()
         else:
             super(QueryParameterLocaleMiddleware, self).process_request(request)
+
+
+class TranslationStatsMiddleware(object):
+    """
+    Collects the instrumentation events of each request, database queries
+    included, as `request.translation_stats`. They are sent with the
+    `json_trans.signals.request_stats` signal, logged on the `json_trans`
+    logger at DEBUG level and added to the `Server-Timing` header.
+    Removed from the middleware chain unless JSON_TRANS_INSTRUMENTATION is set.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        if not instrumentation.ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        with instrumentation.collect(queries=True) as stats:
+            request.translation_stats = stats
+            response = self.get_response(request)
+
+        return self.process_stats(request, response, stats)
+
+    async def __acall__(self, request):
+        # Queries run in other threads, only translation events are collected.
+        with instrumentation.collect() as stats:
+            request.translation_stats = stats
+            response = await self.get_response(request)
+
+        return self.process_stats(request, response, stats)
+
+    def process_stats(self, request, response, stats):
+        request_stats.send(sender=type(self), request=request, stats=stats)
+        logger.debug('%s %s %r', request.method, request.path, stats)
+
+        timings = ', '.join(
+            'jt-%s;dur=%.3f' % (name, duration * 1000) for name, duration in stats.times.items() if duration
+        )
+
+        if timings:
+            response['Server-Timing'] = ', '.join(filter(None, [response.get('Server-Timing'), timings]))
+
+        return response
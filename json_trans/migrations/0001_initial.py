@@ -0,0 +1,30 @@
+# Generated by Django 2.1.11 on 2026-10-16 18:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationCoverage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=255)),
+                ('language', models.CharField(max_length=15)),
+                ('field', models.CharField(max_length=255)),
+                ('translated', models.IntegerField(default=0)),
+                ('total', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='translationcoverage',
+            unique_together={('model', 'language', 'field')},
+        ),
+    ]
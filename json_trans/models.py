@@ -1,22 +1,29 @@
 from __future__ import unicode_literals
-import os
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
 from django.core.exceptions import ValidationError
-from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
-from django.db.models import options, ImageField, FileField
+from django.db import models, router, transaction
+from django.db.models import options
+from django.db.models.signals import class_prepared, post_delete
 from django.db.models.fields.files import ImageFieldFile, FieldFile
 from django.utils.translation import get_language
-from django.core.files.storage import DefaultStorage
 
+from . import cache as translation_cache
+from . import coverage as translation_coverage
+from . import files as translation_files
+from . import storage as translation_storage
+from .descriptors import contribute_translated_fields
 from .exceptions import NonTranslatableFieldError
+from .fallback import get_fallback_chain
+from .expressions import merged_translations, updated_translations
 from .managers import TranslationManager, TranslationMixin
+from .utils import run_sync
 
 
-options.DEFAULT_NAMES += ('translatable_fields',)
-fs = DefaultStorage()
+options.DEFAULT_NAMES += ('translatable_fields', 'translation_storage')
+
+COMPACT_PICKLE = getattr(settings, 'JSON_TRANS_COMPACT_PICKLE', False)
 
 
 class JSONEncoder(DjangoJSONEncoder):
@@ -27,10 +34,6 @@ class JSONEncoder(DjangoJSONEncoder):
             return super().default(o)
 
 
-def save_form_data(instance, data):
-    pass
-
-
 class Language(object):
     def __init__(self, **translations):
         for field, translation in translations.items():
@@ -40,6 +43,19 @@ class Language(object):
 class TranslatableModel(models.Model, TranslationMixin):
     translations = JSONField(null=True, blank=True, editable=False, default=dict, encoder=JSONEncoder)
     _translated = None
+    # Languages loaded by a sliced queryset, None if `translations` is complete
+    # (with table storage: if none is loaded yet).
+    _loaded_languages = None
+    # Keys changed by translate() since the instance was loaded or saved as
+    # {language_code: field names}, None if the whole column has to be written.
+    # Read it with get_dirty_translations(), which adds the in place changes.
+    _dirty_translations = None
+    # Per language copy of `translations` as loaded or saved, to find the
+    # values changed in place, e.g. `obj.translations['tr']['title'] = ...`.
+    _translations_snapshot = None
+    # Storage writes of translated files still running in the thread pool, as
+    # (language_code, field name, provisional file name, future).
+    _pending_uploads = None
 
     objects = TranslationManager()
 
@@ -47,36 +63,82 @@ class TranslatableModel(models.Model, TranslationMixin):
         self._language_code = get_language()
         super(TranslatableModel, self).__init__(*args, **kwargs)
 
-    def __getattribute__(self, name):
-        fallback = object.__getattribute__(self, 'fallback')
-        attr = object.__getattribute__(self, name)
-        opts = object.__getattribute__(self, '_meta')
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(TranslatableModel, cls).from_db(db, field_names, values)
+        instance.track_translations()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super(TranslatableModel, self).refresh_from_db(using, fields)
+
+        if fields is None or 'translations' in fields:
+            if translation_storage.is_table_storage(type(self)):
+                # The column stays NULL, the languages are loaded again from the table.
+                self._loaded_languages = None
+
+            # Reloaded (or loaded, if it was deferred) from the database.
+            self.track_translations()
+
+            if self._translated is not None:
+                self.language(self._language_code)
+
+    def track_translations(self, language_code=None):
+        """
+        Starts tracking the changes of `translations` from its current value,
+        only of `language_code` if given.
+        """
+        translations = self.__dict__.get('translations')
+
+        if language_code is None:
+            self._dirty_translations = {}
+            self._translations_snapshot = {
+                code: dict(fields) if isinstance(fields, dict) else fields for code, fields in translations.items()
+            } if isinstance(translations, dict) else None
+        elif self._dirty_translations is not None:
+            self._dirty_translations.pop(language_code, None)
+            fields = (translations or {}).get(language_code)
+
+            if self._translations_snapshot is not None:
+                self._translations_snapshot[language_code] = dict(fields) if isinstance(fields, dict) else fields
+
+    def get_dirty_translations(self):
+        """
+        Returns the keys of `translations` changed since the instance was
+        loaded or saved as {language_code: field names}, both by translate()
+        and in place. None if the whole column has to be written, e.g. when
+        it was assigned or keys were removed from it.
+        """
+        dirty = self._dirty_translations
+        snapshot = self._translations_snapshot
+
+        if dirty is None or snapshot is None:
+            return dirty
+
+        translations = self.__dict__.get('translations')
+
+        if not isinstance(translations, dict):
+            return None
 
-        default_lang = object.__getattribute__(self, 'default_language_code')
-        active_lang = get_language()
+        dirty = {code: set(names) for code, names in dirty.items()}
 
-        if name not in opts.translatable_fields or default_lang == active_lang:
-            return attr
+        for code in set(snapshot).union(translations):
+            fields, previous = translations.get(code), snapshot.get(code)
 
-        translated = object.__getattribute__(self, '_translated')
+            if fields == previous:
+                continue
 
-        if translated:
-            if hasattr(translated, name):
-                _field = self._meta.get_field(name)
-                if isinstance(_field, ImageField):
-                    return ImageFieldFile(self, _field, getattr(translated, name, attr if fallback else ''))
-                elif isinstance(_field, FileField):
-                    return FieldFile(self, _field, getattr(translated, name, attr if fallback else ''))
-                else:
-                    return getattr(translated, name, attr if fallback else '')
+            previous = previous if isinstance(previous, dict) else {}
 
-            elif hasattr(translated, '__iter__') and (active_lang in translated or name in translated):
-                try:
-                    return translated.get(active_lang).get(name, '')
-                except Exception as e:
-                    print('exception happened in model getattribute', e)
+            if not isinstance(fields, dict) or set(previous).difference(fields):
+                return None
 
-        return attr
+            changed = {name for name, value in fields.items() if name not in previous or previous[name] != value}
+
+            if changed:
+                dirty.setdefault(code, set()).update(changed)
+
+        return dirty
 
     def clean_fields(self, exclude=None):
         if exclude is None:
@@ -111,7 +173,8 @@ class TranslatableModel(models.Model, TranslationMixin):
         self._language_code = self.get_language_code(language_code)
 
         if not self.is_default_language(self._language_code):
-            self.translations = self.translations or {}
+            if self.translations is None:
+                self.translations = {}
             self.translations[self._language_code] = self.translations.get(
                 self._language_code, {}
             )
@@ -123,17 +186,23 @@ class TranslatableModel(models.Model, TranslationMixin):
             if self.is_default_language(self._language_code):
                 setattr(self, name, value)
             else:
-                if isinstance(value, InMemoryUploadedFile):
+                if translation_files.is_upload(value):
+                    value, future = translation_files.store(self._meta.get_field(name), value)
 
-                    setattr(self._meta.fields[-1], 'save_form_data', save_form_data)
-                    _file = value
-
-                    save_path = os.path.join(settings.MEDIA_ROOT, 'uploads', _file.name)
-                    filename = fs.save(save_path, _file)
-                    value = fs.url(filename)
+                    if future is not None:
+                        upload = (self._language_code, name, value, future)
+                        self._pending_uploads = (self._pending_uploads or []) + [upload]
+                elif isinstance(value, FieldFile):
+                    value = value.name
 
                 self.translations.get(self._language_code, {})[name] = value
 
+                if self._dirty_translations is not None:
+                    self._dirty_translations.setdefault(self._language_code, set()).add(name)
+
+        if self._translated is not None:
+            self._translated.clear()
+
         if language_code:
             self.language(language_code)
 
@@ -142,23 +211,34 @@ class TranslatableModel(models.Model, TranslationMixin):
         self._language_code = get_language()
 
     def language(self, language_code=None):
-        self.reset_language()
-        fields = self._meta.translatable_fields
-        self._language_code = self.get_language_code(language_code)
+        language_code = self.get_language_code(language_code)
+        self._activate_language(language_code, self.is_default_language(language_code))
 
-        if self.is_default_language(language_code):
-            return self
+        return self
 
-        self.default_language = Language(**{f: getattr(self, f, None) for f in fields})
-        translations = self.translations or {}
+    def _activate_language(self, language_code, is_default):
+        """
+        Makes translatable fields resolve to `language_code`. `is_default` is
+        passed in so querysets compute it once for all of their objects.
+        """
+        self._language_code = language_code
+        self._translated = None
 
-        translations = translations.get(self._language_code, {})
+        if not is_default:
+            # No query for objects loaded by a queryset in this language.
+            translation_storage.load(self, get_fallback_chain(language_code, self.fallback))
 
-        if (not translations and not self.fallback) or translations:
-            translations = self.populate_translations(translations)
-            self._translated = Language(**translations)
+            # Filled lazily by TranslatedFieldDescriptor, missing fields
+            # resolve along the fallback chain of the language, then to ''.
+            self._translated = {}
 
-        return self
+    @property
+    def default_language(self):
+        """
+        The default language values of the translatable fields.
+        """
+        cls = type(self)
+        return Language(**{f: getattr(cls, f).get_default(self) for f in self._meta.translatable_fields})
 
     def language_or_none(self, language_code):
         language_code = self.get_language_code(language_code)
@@ -166,6 +246,8 @@ class TranslatableModel(models.Model, TranslationMixin):
         if self.is_default_language(language_code):
             return self.language(language_code)
 
+        translation_storage.load(self, (language_code,))
+
         if not self.translations or not self.translations.get(language_code):
             return None
 
@@ -181,24 +263,214 @@ class TranslatableModel(models.Model, TranslationMixin):
         if self.is_default_language(language_code):
             return {k: v for k, v in self.__dict__.items() if k in tf}
 
+        translation_storage.load(self, (language_code,))
+
+        return self.get_translation_dict(language_code)
+
+    def __getstate__(self):
+        if COMPACT_PICKLE:
+            return self.get_compact_state()
+
+        return super(TranslatableModel, self).__getstate__()
+
+    def get_compact_state(self):
+        """
+        Returns the pickled state of the instance without its per instance
+        caches and, for saved objects, with only the languages it resolves
+        (the active one and its fallback chain) and the ones with unsaved
+        translations. Unpickled objects keep their language and behave as
+        loaded by a sliced queryset, other languages are loaded on use.
+        """
+        state = dict(self.__dict__)
+        state.pop('_translated_files', None)
+
+        if self._translated is not None:
+            # Resolved again on first read.
+            state['_translated'] = {}
+
+        dirty = self.get_dirty_translations()
+
+        if self.pk is None or dirty is None or 'translations' not in state:
+            return state
+
+        loaded = self._loaded_languages
+        languages = [
+            code for code in get_fallback_chain(self._language_code, self.fallback)
+            if code != self.default_language_code and (loaded is None or code in loaded)
+        ]
+        languages += [code for code in dirty if code not in languages]
+        translations = state['translations'] or {}
+
+        snapshot = self._translations_snapshot or {}
+
+        state['translations'] = {code: translations[code] for code in languages if code in translations}
+        state['_translations_snapshot'] = {code: snapshot[code] for code in languages if code in snapshot}
+        state['_loaded_languages'] = tuple(languages)
+
+        return state
+
+    def get_translation_dict(self, language_code):
+        tf = self._meta.translatable_fields
         translations = self.translations or {}
 
         if translations:
             translations = translations.get(language_code, {})
-            return {k: v for k, v in translations.items() if v and k in tf}
+            result = {k: v for k, v in translations.items() if v and k in tf}
+
+            for name, value in result.items():
+                field = self._meta.get_field(name)
+
+                if isinstance(field, models.FileField):
+                    # Files are stored by name, given as URLs like before.
+                    result[name] = field.storage.url(translation_files.stored_name(field.storage, value))
+
+            return result
 
         return {}
 
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        dirty = self.get_dirty_translations()
+
+        if translation_storage.is_table_storage(type(self)):
+            # Written to the translation table by save().
+            values = [(field, model, value) for field, model, value in values if field.name != 'translations']
+        elif dirty is not None or self._loaded_languages is not None:
+            updated_values = []
+
+            for field, model, value in values:
+                if field.name == 'translations':
+                    if dirty is not None:
+                        # Nothing translated, leave the column out of the UPDATE.
+                        if not dirty:
+                            continue
+                        value = updated_translations(value, dirty, field.encoder)
+                    else:
+                        value = merged_translations(value, self._loaded_languages, field.encoder)
+
+                updated_values.append((field, model, value))
+
+            values = updated_values
+
+        return super(TranslatableModel, self)._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+    def _do_insert(self, manager, using, fields, update_pk, raw):
+        if translation_storage.is_table_storage(type(self)):
+            fields = [field for field in fields if field.name != 'translations']
+
+        if '_inserted' in self.__dict__:
+            # Counted as a new object by the coverage summary.
+            self._inserted = True
+
+        return super(TranslatableModel, self)._do_insert(manager, using, fields, update_pk, raw)
+
+    def _save_rows(self, using, saves_translations, coverage, *args, **kwargs):
+        """
+        Writes the row (and translation rows) of the instance, in a
+        transaction with table storage or coverage.
+        """
+        if coverage:
+            # Read in the transaction of the write. An explicit pk can match
+            # a stored row, see _do_insert() for created.
+            previous = set() if self.pk is None else translation_coverage.stored_filled(self, using)
+            self._inserted = False
+
+        super(TranslatableModel, self).save(*args, **kwargs)
+
+        if saves_translations and translation_storage.is_table_storage(type(self)):
+            translation_storage.save(self, using)
+
+        if coverage:
+            translation_coverage.record_save(self, previous, self.__dict__.pop('_inserted'), using)
+
     def save(self, *args, **kwargs):
         language_code = self._language_code
         self.reset_language()
 
-        if not self.translations:
+        if self.translations is None:
             self.translations = dict()
 
-        super(TranslatableModel, self).save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        update_fields = kwargs.get('update_fields')
+        saves_translations = update_fields is None or 'translations' in update_fields
+        coverage = translation_coverage.is_enabled()
+
+        if self._pending_uploads:
+            # Raises if a translated file couldn't be stored.
+            pending, self._pending_uploads = self._pending_uploads, None
+            for code, name, value, future in pending:
+                stored = future.result()
+                fields = self.translations.get(code) or {}
+
+                # Unless translated again since, the storage may have picked another name.
+                if fields.get(name) == value:
+                    fields[name] = stored
+
+        if coverage or translation_storage.is_table_storage(type(self)):
+            with transaction.atomic(using=using, savepoint=False):
+                self._save_rows(using, saves_translations, coverage, *args, **kwargs)
+        else:
+            self._save_rows(using, saves_translations, coverage, *args, **kwargs)
+
+        if saves_translations:
+            self.track_translations()
+
+        translation_cache.invalidate(self)
 
         self.language(language_code)
 
+    async def atranslate(self, language_code=None, **kwargs):
+        """
+        Async version of translate(). Only uploaded files, which are written to
+        the storage, are handled outside of the event loop.
+        """
+        # Resolved here, the active language isn't shared with other threads.
+        language_code = self.get_language_code(language_code)
+
+        if any(translation_files.is_upload(value) for value in kwargs.values()):
+            await run_sync(self.translate, language_code, **kwargs)
+        else:
+            self.translate(language_code, **kwargs)
+
+    async def asave(self, *args, **kwargs):
+        await run_sync(self.save, *args, **kwargs)
+
     class Meta:
         abstract = True
+
+
+class TranslationCoverage(models.Model):
+    """
+    Number of objects of `model` whose `field` is translated to `language`,
+    kept up to date when `settings.JSON_TRANS_COVERAGE` is set. See
+    `json_trans.coverage`.
+    """
+    model = models.CharField(max_length=255)
+    language = models.CharField(max_length=15)
+    field = models.CharField(max_length=255)
+    translated = models.IntegerField(default=0)
+    total = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('model', 'language', 'field')
+
+    def __str__(self):
+        return '%s.%s [%s]: %d/%d' % (self.model, self.field, self.language, self.translated, self.total)
+
+
+def prepare_translatable_model(sender, **kwargs):
+    if issubclass(sender, TranslatableModel):
+        contribute_translated_fields(sender)
+
+        if translation_storage.is_table_storage(sender) and not sender._meta.abstract and not sender._meta.proxy:
+            sender._meta.translation_model = translation_storage.create_translation_model(sender)
+
+        if translation_coverage.is_enabled() and not sender._meta.abstract:
+            # Per model, a receiver for every sender would disable fast deletes.
+            post_delete.connect(translation_coverage.record_delete, sender=sender, weak=False)
+
+        if translation_cache.is_enabled() and not sender._meta.abstract:
+            post_delete.connect(translation_cache.record_delete, sender=sender, weak=False)
+
+
+class_prepared.connect(prepare_translatable_model)
@@ -0,0 +1,79 @@
+from django.db.migrations.operations.base import Operation
+
+from .indexes import create_index_sql, drop_index_sql, translation_indexes
+from .storage import JSON
+
+
+class CreateTranslationIndexes(Operation):
+    """
+    Creates the indexes of `json_trans.indexes.translation_indexes()` for a
+    model. The trigram indexes need the `pg_trgm` extension, see
+    `django.contrib.postgres.operations.TrigramExtension`.
+    Historical models have neither the `Meta` options nor the `fallback` of
+    the model, so the translatable `fields`, the `storage` and the
+    `fallback_chains` (`{language: chain}`, languages missing from it aren't
+    falling back) are arguments of the operation.
+    Usage example:
+        operations = [
+            CreateTranslationIndexes(
+                'product', fields=['title'], fallback_chains={'pt-br': ['pt-br', 'pt']}, trigram=True, search=True,
+            ),
+        ]
+    """
+    reversible = True
+
+    def __init__(self, model_name, fields, languages=None, trigram=False, search=False, storage=JSON,
+                 fallback_chains=None):
+        self.model_name = model_name
+        self.fields = list(fields)
+        self.languages = languages
+        self.trigram = trigram
+        self.search = search
+        self.storage = storage
+        self.fallback_chains = fallback_chains
+
+    def deconstruct(self):
+        kwargs = {'model_name': self.model_name, 'fields': self.fields}
+
+        if self.languages is not None:
+            kwargs['languages'] = self.languages
+        if self.trigram:
+            kwargs['trigram'] = self.trigram
+        if self.search:
+            kwargs['search'] = self.search
+        if self.storage != JSON:
+            kwargs['storage'] = self.storage
+        if self.fallback_chains:
+            kwargs['fallback_chains'] = self.fallback_chains
+
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def get_indexes(self, model, connection):
+        return translation_indexes(
+            model, self.fields, self.languages, self.trigram, self.search, connection,
+            storage=self.storage, fallback_chains=self.fallback_chains or {},
+        )
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+
+        if schema_editor.connection.vendor != 'postgresql' or not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        for name, method, expression in self.get_indexes(model, schema_editor.connection):
+            schema_editor.execute(create_index_sql(model, schema_editor.connection, name, method, expression))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+
+        if schema_editor.connection.vendor != 'postgresql' or not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+
+        for name, method, expression in self.get_indexes(model, schema_editor.connection):
+            schema_editor.execute(drop_index_sql(schema_editor.connection, name))
+
+    def describe(self):
+        return 'Creates translation indexes on %s' % self.model_name
@@ -0,0 +1,112 @@
+"""
+Keyset (cursor) pagination over translated sort keys, see
+`TranslationQuerySet.keyset_page()`.
+
+Pages are ordered by the translated expression of the sort key (the one of
+`filter()` and `order_by_json_path()`, indexed by `json_trans_indexes`) then
+by primary key, the next page seeks past the last row with `(key, pk) > (%s, %s)`
+(`<` descending) instead of an OFFSET, so deep pages cost as much as the
+first one and don't shift when other rows change. Rows without a key (NULL,
+e.g. not translated and without fallback) come last, in primary key order.
+
+Cursors are signed with `django.core.signing`, tampered cursors and cursors
+of another sort key, language or order raise `InvalidCursorError`.
+"""
+import json
+from collections import namedtuple
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.db.models.sql.where import AND
+
+from .exceptions import InvalidCursorError
+from .expressions import RowCompare
+
+KEY_ALIAS = '_keyset_key'
+CURSOR_SALT = 'json_trans.pagination'
+
+
+class KeysetPage(namedtuple('KeysetPage', 'object_list next_cursor')):
+    __slots__ = ()
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class CursorSerializer(object):
+    """
+    `signing.JSONSerializer` with `DjangoJSONEncoder`, for date and decimal keys.
+    """
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(',', ':'), cls=DjangoJSONEncoder).encode('latin-1')
+
+    def loads(self, data):
+        return json.loads(data.decode('latin-1'))
+
+
+def encode_cursor(json_path, language_code, descending, key, pk):
+    return signing.dumps(
+        [json_path, language_code, descending, key, pk], salt=CURSOR_SALT, serializer=CursorSerializer,
+    )
+
+
+def decode_cursor(cursor, json_path, language_code, descending):
+    """
+    Returns the `(key, pk)` of the last row of the previous page.
+    """
+    try:
+        value = signing.loads(cursor, salt=CURSOR_SALT, serializer=CursorSerializer)
+    except (signing.BadSignature, ValueError):
+        raise InvalidCursorError(cursor)
+
+    if not isinstance(value, list) or len(value) != 5 or value[:3] != [json_path, language_code, descending]:
+        raise InvalidCursorError(cursor)
+
+    return value[3], value[4]
+
+
+def keyset_page(queryset, json_path, cursor=None, size=20, language_code=None, order='asc'):
+    """
+    Returns the `KeysetPage` of `queryset` following `cursor`, the first page
+    without it.
+    """
+    language_code = queryset.get_language_code(language_code or queryset._language_code)
+    descending = order == 'desc'
+    prefix = '-' if descending else ''
+    key, pk = decode_cursor(cursor, json_path, language_code, descending) if cursor else (None, None)
+
+    if json_path in queryset.model._meta.translatable_fields:
+        # The base column in the default language.
+        expression = queryset.translated_expression(json_path, language_code)
+    else:
+        expression = queryset.json_path_expression(json_path, language_code)
+
+    queryset = queryset.annotate(**{KEY_ALIAS: expression})
+    tail = queryset.filter(**{KEY_ALIAS + '__isnull': True}).order_by(prefix + 'pk')
+
+    if cursor and key is None:
+        # Already in the rows without a key.
+        objects = list(tail.filter(**{'pk__lt' if descending else 'pk__gt': pk})[:size + 1])
+    else:
+        page = queryset.filter(**{KEY_ALIAS + '__isnull': False}).order_by(prefix + KEY_ALIAS, prefix + 'pk')
+
+        if cursor:
+            seek = RowCompare([F(KEY_ALIAS), F('pk')], [key, pk], descending)
+            page.query.where.add(seek.resolve_expression(page.query), AND)
+
+        # One more row than needed tells whether there is a next page.
+        objects = list(page[:size + 1])
+
+        if len(objects) <= size:
+            objects += list(tail[:size + 1 - len(objects)])
+
+    if len(objects) <= size:
+        return KeysetPage(objects, None)
+
+    objects = objects[:size]
+    last = objects[-1]
+
+    return KeysetPage(objects, encode_cursor(json_path, language_code, descending, getattr(last, KEY_ALIAS), last.pk))
@@ -0,0 +1,71 @@
+"""
+Full text search on translated fields, see `TranslationQuerySet.search()`.
+
+The text search configuration of each language is looked up in
+`settings.JSON_TRANS_SEARCH_CONFIGS` (`{language_code: config}`), then guessed
+from the language part of the code, `simple` otherwise.
+"""
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db.models import CharField, TextField
+
+from .expressions import translated_field_sql
+
+LANGUAGES = OrderedDict(settings.LANGUAGES)
+DEFAULT_CONFIG = 'simple'
+BUILTIN_CONFIGS = {
+    'ar': 'arabic', 'da': 'danish', 'de': 'german', 'el': 'greek', 'en': 'english', 'es': 'spanish',
+    'fi': 'finnish', 'fr': 'french', 'hu': 'hungarian', 'id': 'indonesian', 'it': 'italian', 'lt': 'lithuanian',
+    'nb': 'norwegian', 'ne': 'nepali', 'nl': 'dutch', 'no': 'norwegian', 'pt': 'portuguese', 'ro': 'romanian',
+    'ru': 'russian', 'sv': 'swedish', 'ta': 'tamil', 'tr': 'turkish',
+}
+
+
+def _build_configs():
+    configs = {}
+    overrides = getattr(settings, 'JSON_TRANS_SEARCH_CONFIGS', {})
+
+    for code in LANGUAGES:
+        configs[code] = overrides.get(code) or BUILTIN_CONFIGS.get(code.split('-')[0].lower(), DEFAULT_CONFIG)
+
+    return configs
+
+
+SEARCH_CONFIGS = _build_configs()
+
+
+def search_config(language_code):
+    return SEARCH_CONFIGS.get(language_code, DEFAULT_CONFIG)
+
+
+def search_fields(model, fields=None):
+    """
+    Returns the text fields among `fields` (the translatable fields of `model`
+    by default), searched by default.
+    """
+    return [
+        name for name in fields or model._meta.translatable_fields
+        if isinstance(model._meta.get_field(name), (CharField, TextField))
+    ]
+
+
+def search_vector(queryset, fields, language_code):
+    """
+    Returns the `SearchVector` of the translated `fields` in `language_code`.
+    """
+    expressions = [queryset.translated_expression(name, language_code) for name in fields]
+    return SearchVector(*expressions, config=search_config(language_code))
+
+
+def search_vector_sql(model, connection, fields, language_codes):
+    """
+    Returns the SQL of `search_vector()`, for expression indexes.
+    `language_codes` is the fallback chain of the searched language.
+    """
+    parts = [translated_field_sql(model, connection, name, language_codes) for name in fields]
+
+    return "to_tsvector('%s'::regconfig, %s)" % (
+        search_config(language_codes[0]), " || ' ' || ".join("COALESCE(%s, '')" % part for part in parts),
+    )
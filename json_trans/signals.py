@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+# Sent, with instrumentation enabled, when a translatable field has no value
+# in the language nor in its fallback chain.
+# Arguments: instance, field, language.
+missing_translation = Signal()
+
+# Sent by TranslationStatsMiddleware at the end of each request.
+# Arguments: request, stats.
+request_stats = Signal()
@@ -0,0 +1,254 @@
+"""
+Storage backends of the translations, selected per model with
+`Meta.translation_storage`:
+    - 'json' (default): every language in the `translations` JSONB column,
+    - 'table': a row per object and language in a generated
+      `<Model>Translation` model (table `<db_table>_translation`), holding
+      the language's `{field: value}` in its `data` JSONB column.
+
+With table storage the rows stay narrow: querysets only load the rows of
+their language and its fallback chain, `save()` only writes the changed
+languages and translated filters and orderings read a single row per object
+with a correlated subquery. `TranslatableModel` keeps the loaded languages
+in `translations` either way, the column itself stays NULL.
+
+`manage.py json_trans_storage` moves existing translations between the
+column and the table.
+"""
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields.jsonb import JsonAdapter
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, models
+from django.db.models import Q
+
+JSON = 'json'
+TABLE = 'table'
+STORAGES = (JSON, TABLE)
+BATCH_SIZE = 1000
+
+
+def get_storage(model):
+    storage = getattr(model._meta, 'translation_storage', JSON)
+
+    if storage not in STORAGES:
+        raise ImproperlyConfigured('%s: translation_storage must be one of %s, got %r.' % (
+            model._meta.label, ', '.join(STORAGES), storage,
+        ))
+
+    return storage
+
+
+def is_table_storage(model):
+    return get_storage(model) == TABLE
+
+
+def translation_table(model):
+    return '%s_translation' % model._meta.db_table
+
+
+def create_translation_model(model):
+    """
+    Returns the `<Model>Translation` model storing the translations of
+    `model`, registered in the app (and app registry) of `model` so
+    migrations create its table.
+    """
+    meta = type('Meta', (), {
+        'apps': model._meta.apps,
+        'app_label': model._meta.app_label,
+        'db_table': translation_table(model),
+        'unique_together': (('master', 'language_code'),),
+    })
+
+    return type('%sTranslation' % model.__name__, (models.Model,), {
+        '__module__': model.__module__,
+        'master': models.ForeignKey(model, on_delete=models.CASCADE, related_name='+'),
+        'language_code': models.CharField(max_length=15),
+        'data': JSONField(default=dict, encoder=model._meta.get_field('translations').encoder),
+        'Meta': meta,
+    })
+
+
+def translated_lookup(model, language_code):
+    """
+    Returns the filter of the objects translated to `language_code`.
+    """
+    if not is_table_storage(model):
+        # `translations @> '{"code": {}}'`, same as `translations ? code`
+        # but can use the GIN jsonb_path_ops index.
+        return Q(translations__contains={language_code: {}})
+
+    rows = model._meta.translation_model._default_manager.filter(language_code=language_code)
+    return Q(pk__in=rows.values('master_id'))
+
+
+def load(instance, language_codes, using=None):
+    """
+    Loads the missing `language_codes` of `instance` with one query: from
+    the translation table with table storage, else the languages a sliced
+    queryset or a compact pickle left out of `translations`. Values
+    translated since it was loaded are kept.
+    """
+    from .expressions import sliced_translations
+
+    if instance.pk is None:
+        return
+
+    model = type(instance)
+    table = is_table_storage(model)
+
+    if not table and instance._loaded_languages is None:
+        # The whole column is loaded.
+        return
+
+    # None if the instance wasn't loaded by a queryset with a language, e.g.
+    # through a foreign key, select_related() or refresh_from_db().
+    loaded = instance._loaded_languages or ()
+
+    missing = [code for code in language_codes if code not in loaded and code != instance.default_language_code]
+
+    if not missing:
+        return
+
+    using = using or instance._state.db
+
+    if table:
+        rows = model._meta.translation_model._default_manager.using(using).filter(
+            master_id=instance.pk, language_code__in=missing,
+        ).values_list('language_code', 'data')
+    else:
+        stored = model._base_manager.using(using).filter(pk=instance.pk).annotate(
+            _translations=sliced_translations(missing),
+        ).values_list('_translations', flat=True).first()
+        rows = [(code, data) for code, data in (stored or {}).items() if data is not None]
+
+    translations = instance.translations
+
+    if translations is None:
+        # Not assigned through the descriptor, which would reset the tracked changes.
+        translations = instance.__dict__['translations'] = {}
+
+        if instance._dirty_translations is not None:
+            instance._translations_snapshot = {}
+
+    snapshot = instance._translations_snapshot
+
+    for language_code, data in rows:
+        if snapshot is not None:
+            # The stored values, the unsaved ones merged below stay changed.
+            snapshot[language_code] = dict(data)
+        data.update(translations.get(language_code) or {})
+        translations[language_code] = data
+
+    instance._loaded_languages = tuple(loaded) + tuple(missing)
+
+
+def write(model, connection, rows):
+    """
+    Merges `rows` of `(pk, language_code, {field: value})` into the
+    translation table of `model`, creating the missing rows. Returns the
+    number of written rows.
+    """
+    qn = connection.ops.quote_name
+    table = qn(translation_table(model))
+    pk_type = model._meta.pk.rel_db_type(connection)
+    encoder = model._meta.get_field('translations').encoder
+    written = 0
+
+    with connection.cursor() as cursor:
+        for i in range(0, len(rows), BATCH_SIZE):
+            batch = rows[i:i + BATCH_SIZE]
+            values = ', '.join(['(%%s::%s, %%s, %%s::jsonb)' % pk_type] * len(batch))
+            sql = (
+                "INSERT INTO {table} (master_id, language_code, data) VALUES {values} "
+                "ON CONFLICT (master_id, language_code) DO UPDATE SET data = {table}.data || EXCLUDED.data"
+            ).format(table=table, values=values)
+            params = []
+
+            for pk, language_code, fields in batch:
+                params += [pk, language_code, JsonAdapter(fields, encoder=encoder)]
+
+            cursor.execute(sql, params)
+            written += cursor.rowcount
+
+    return written
+
+
+def write_queryset(queryset, language_code, fields):
+    """
+    Merges `fields` into the `language_code` row of every object of
+    `queryset` with a single INSERT ... SELECT. Returns the number of
+    written rows.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    encoder = model._meta.get_field('translations').encoder
+    select, params = queryset.order_by().values_list('pk').query.get_compiler(queryset.db).as_sql()
+    sql = (
+        "INSERT INTO {table} (master_id, language_code, data) SELECT q.pk, %s, %s::jsonb FROM ({select}) AS q (pk) "
+        "ON CONFLICT (master_id, language_code) DO UPDATE SET data = {table}.data || EXCLUDED.data"
+    ).format(table=connection.ops.quote_name(translation_table(model)), select=select)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [language_code, JsonAdapter(fields, encoder=encoder)] + list(params))
+        return cursor.rowcount
+
+
+def save(instance, using):
+    """
+    Writes the translations of a saved table stored `instance`: the changed
+    fields if they are tracked, every loaded language otherwise.
+    """
+    translations = instance.translations or {}
+    dirty = instance.get_dirty_translations()
+
+    if dirty is not None:
+        changes = {
+            code: {name: (translations.get(code) or {}).get(name) for name in fields}
+            for code, fields in dirty.items()
+        }
+    else:
+        loaded = instance._loaded_languages
+        changes = {code: fields for code, fields in translations.items() if loaded is None or code in loaded}
+
+    rows = [
+        (instance.pk, code, fields) for code, fields in changes.items()
+        if fields and code != instance.default_language_code
+    ]
+
+    if rows:
+        write(type(instance), connections[using], rows)
+
+
+def move_sql(model, connection, storage):
+    """
+    Returns the statements moving the translations of `model` to `storage`,
+    from the table to the column or the other way around. The table has to
+    exist, i.e. be migrated while `model` used table storage.
+    """
+    qn = connection.ops.quote_name
+    opts = model._meta
+    context = {
+        'table': qn(opts.db_table),
+        'translations': qn(opts.get_field('translations').column),
+        'pk': qn(opts.pk.column),
+        'translation_table': qn(translation_table(model)),
+    }
+
+    if storage == TABLE:
+        statements = [
+            "INSERT INTO {translation_table} (master_id, language_code, data) "
+            "SELECT m.{pk}, l.key, l.value FROM {table} m CROSS JOIN LATERAL jsonb_each("
+            "CASE WHEN jsonb_typeof(m.{translations}) = 'object' THEN m.{translations} ELSE '{{}}' END) l "
+            "WHERE jsonb_typeof(l.value) = 'object' "
+            "ON CONFLICT (master_id, language_code) DO UPDATE SET data = {translation_table}.data || EXCLUDED.data",
+            "UPDATE {table} SET {translations} = NULL WHERE {translations} IS NOT NULL",
+        ]
+    else:
+        statements = [
+            "UPDATE {table} SET {translations} = COALESCE({table}.{translations}, '{{}}'::jsonb) || t.translations "
+            "FROM (SELECT master_id, jsonb_object_agg(language_code, data) AS translations "
+            "FROM {translation_table} GROUP BY master_id) t WHERE {table}.{pk} = t.master_id",
+            "DELETE FROM {translation_table}",
+        ]
+
+    return [sql.format(**context) for sql in statements]
@@ -0,0 +1,1181 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+from collections import Counter
+from unittest import mock, skipUnless
+
+from django.apps import apps
+from django.apps.registry import Apps
+from django.conf import settings
+from django.contrib.postgres.fields import JSONField
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.db import DEFAULT_DB_ALIAS, connection, models
+from django.db.migrations.state import ModelState, ProjectState
+from django.forms import modelform_factory
+from django.http import HttpResponse
+from django.db.models import sql
+from django.db.models.sql.compiler import SQLCompiler
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import translation
+
+from . import cache as translation_cache
+from . import coverage as translation_coverage
+from . import fallback
+from . import files as translation_files
+from . import instrumentation
+from .descriptors import InstrumentedTranslatedFieldDescriptor
+from .exceptions import InvalidCursorError, NonTranslatableFieldError
+from .forms import MultiLanguageModelForm, translation_field_name
+from .indexes import index_name, translation_indexes
+from .middleware import QueryParameterLocaleMiddleware, TranslationStatsMiddleware, get_language_from_parameter
+from .models import TranslatableModel
+from .operations import CreateTranslationIndexes
+from .pagination import encode_cursor
+from .search import search_config
+from .signals import missing_translation, request_stats
+from .transfer import FORMATS, TranslationRecord, export_records, import_records
+from .utils import iscoroutinefunction
+
+LANGUAGE_CODE = settings.LANGUAGE_CODE
+OTHER_LANGUAGES = [code for code, name in settings.LANGUAGES if code != LANGUAGE_CODE]
+FIRST, SECOND = (OTHER_LANGUAGES + [None, None])[:2]
+
+# Registered apart from the project's models, the database tests create their tables.
+test_apps = Apps([])
+
+
+def create_model(name, fields, **meta):
+    meta = type('Meta', (), dict({'app_label': 'json_trans', 'db_table': 'json_trans_test_%s' % name.lower(),
+                                  'apps': test_apps}, **meta))
+    return type(name, (TranslatableModel,), dict(fields, __module__=__name__, Meta=meta))
+
+
+Product = create_model('Product', {
+    'title': models.CharField(max_length=255),
+    'description': models.TextField(blank=True),
+    'price': models.IntegerField(default=0),
+}, translatable_fields=('title', 'description'))
+
+Article = create_model('Article', {
+    'title': models.CharField(max_length=255),
+}, translatable_fields=('title',), translation_storage='table')
+
+Comment = type('Comment', (models.Model,), {
+    '__module__': __name__,
+    'article': models.ForeignKey(Article, on_delete=models.CASCADE),
+    'Meta': type('Meta', (), {'app_label': 'json_trans', 'db_table': 'json_trans_test_comment', 'apps': test_apps}),
+})
+
+
+Document = create_model('Document', {
+    'attachment': models.FileField(blank=True, storage=FileSystemStorage(base_url='/media/')),
+}, translatable_fields=('attachment',))
+
+
+Review = create_model('Review', {
+    'product': models.ForeignKey(Product, on_delete=models.CASCADE),
+    'body': models.TextField(blank=True),
+}, translatable_fields=('body',))
+
+
+def from_db(model, **values):
+    """
+    Returns an instance of `model` as loaded from the database.
+    """
+    names = [f.attname for f in model._meta.concrete_fields]
+    return model.from_db(DEFAULT_DB_ALIAS, names, [values.get(name) for name in names])
+
+
+def make_product(pk=1, translations=None, title='Base', description='', price=0):
+    return from_db(Product, id=pk, translations=translations, title=title, description=description, price=price)
+
+
+def json_params(expression):
+    return [getattr(param, 'adapted', param) for param in expression.params]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def update_value(obj):
+    """
+    Returns the value `save()` would write to the `translations` column.
+    """
+    with mock.patch.object(models.Model, '_do_update', return_value=True) as do_update:
+        field = Product._meta.get_field('translations')
+        obj._do_update(None, DEFAULT_DB_ALIAS, obj.pk, [(field, None, obj.translations)], None, False)
+
+    values = do_update.call_args[0][3]
+    return values[0][2] if values else None
+
+
+def fallback_chains(*chain):
+    """
+    Makes FIRST fall back to `chain`, to LANGUAGE_CODE after it with
+    `JSON_TRANS_FALLBACK`.
+    """
+    return mock.patch.multiple(fallback, FALLBACK_CHAINS={
+        False: dict(fallback.FALLBACK_CHAINS[False], **{FIRST: (FIRST,) + chain}),
+        True: dict(fallback.FALLBACK_CHAINS[True], **{FIRST: (FIRST,) + chain + (LANGUAGE_CODE,)}),
+    })
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+class DescriptorTests(SimpleTestCase):
+
+    def test_get_in_active_language(self):
+        obj = make_product(translations={FIRST: {'title': 'Translated'}}).language(FIRST)
+
+        with translation.override(FIRST):
+            self.assertEqual(obj.title, 'Translated')
+            self.assertEqual(obj.description, '')
+
+        with translation.override(LANGUAGE_CODE):
+            self.assertEqual(obj.title, 'Base')
+
+    def test_set_writes_base_column(self):
+        obj = make_product(translations={FIRST: {'title': 'Translated'}}).language(FIRST)
+
+        with translation.override(FIRST):
+            obj.title = 'New base'
+            self.assertEqual(obj.title, 'Translated')
+
+        self.assertEqual(obj.__dict__['title'], 'New base')
+
+    def test_translate(self):
+        obj = make_product()
+        obj.translate(FIRST, title='Translated')
+
+        with translation.override(FIRST):
+            self.assertEqual(obj.title, 'Translated')
+
+        self.assertEqual(obj.translations, {FIRST: {'title': 'Translated'}})
+        self.assertEqual(obj.__dict__['title'], 'Base')
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+class FallbackTests(SimpleTestCase):
+
+    def test_resolves_along_chain(self):
+        obj = make_product(translations={SECOND: {'title': 'Second'}})
+
+        with fallback_chains(SECOND), translation.override(FIRST):
+            self.assertEqual(obj.language(FIRST).title, 'Second')
+            self.assertEqual(obj.description, '')
+
+    def test_resolves_to_base_column(self):
+        obj = make_product(translations={SECOND: {'description': 'Second'}})
+
+        with fallback_chains(SECOND), mock.patch.object(Product, 'fallback', True), translation.override(FIRST):
+            self.assertEqual(obj.language(FIRST).title, 'Base')
+            self.assertEqual(obj.description, 'Second')
+
+    def test_assignment_drops_resolved_base_value(self):
+        obj = make_product()
+
+        with fallback_chains(), mock.patch.object(Product, 'fallback', True), translation.override(FIRST):
+            self.assertEqual(obj.language(FIRST).title, 'Base')
+            obj.title = 'New base'
+            self.assertEqual(obj.title, 'New base')
+
+    @mock.patch.object(Product, 'fallback', False)
+    def test_language_keeps_untranslated_objects(self):
+        with fallback_chains():
+            self.assertIn('@>', str(Product.objects.language(FIRST).query))
+
+        with fallback_chains(SECOND):
+            self.assertNotIn('@>', str(Product.objects.language(FIRST).query))
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(Product, 'fallback', False)
+class ProjectionTests(SimpleTestCase):
+
+    def setUp(self):
+        patch = fallback_chains()
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def sql(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return sql % tuple("'%s'" % (param,) for param in params)
+
+    def test_values(self):
+        sql = self.sql(Product.objects.language(FIRST).values('title', 'price'))
+
+        self.assertIn('"json_trans_test_product"."price", ', sql)
+        self.assertIn("""("json_trans_test_product"."translations" #>> '{%s,title}') AS "title""" % FIRST, sql)
+
+    def test_values_list_fallback(self):
+        with fallback_chains(SECOND):
+            sql = self.sql(Product.objects.language(FIRST).values_list('title', flat=True))
+
+        self.assertIn("#>> '{%s,title}'" % FIRST, sql)
+        self.assertIn("#>> '{%s,title}'" % SECOND, sql)
+        self.assertIn('COALESCE(', sql)
+
+    def test_default_language(self):
+        sql = self.sql(Product.objects.language(LANGUAGE_CODE).values_list('title'))
+
+        self.assertEqual(sql.split(' FROM ')[0], 'SELECT "json_trans_test_product"."title"')
+
+    def test_translated_annotate(self):
+        sql = self.sql(Product.objects.language(FIRST).translated_annotate(name='title'))
+
+        self.assertIn("""("json_trans_test_product"."translations" #>> '{%s,title}') AS "name""" % FIRST, sql)
+
+    def test_table_storage(self):
+        sql = self.sql(Article.objects.language(FIRST).values('title'))
+
+        self.assertIn('FROM "json_trans_test_article_translation" WHERE master_id = "json_trans_test_article"."id"', sql)
+        self.assertIn("AND language_code = '%s')" % FIRST, sql)
+        self.assertIn('AS "title" FROM "json_trans_test_article"', sql)
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch('json_trans.coverage.is_enabled', return_value=False)
+class DirtyTranslationsTests(SimpleTestCase):
+
+    def make_product(self):
+        return make_product(translations={FIRST: {'title': 'First', 'description': 'D'}, SECOND: {'title': 'Second'}})
+
+    def test_translate(self, is_enabled):
+        obj = self.make_product()
+        obj.translate(SECOND, description='Description')
+
+        self.assertEqual(obj.get_dirty_translations(), {SECOND: {'description'}})
+        self.assertEqual(json_params(update_value(obj)), [[SECOND], SECOND, {'description': 'Description'}])
+
+    def test_in_place_change(self, is_enabled):
+        obj = self.make_product()
+        obj.translations[FIRST]['title'] = 'Changed'
+
+        self.assertEqual(obj.get_dirty_translations(), {FIRST: {'title'}})
+        self.assertEqual(json_params(update_value(obj)), [[FIRST], FIRST, {'title': 'Changed'}])
+
+    def test_unchanged(self, is_enabled):
+        self.assertIsNone(update_value(self.make_product()))
+
+    def test_removed_key_writes_column(self, is_enabled):
+        obj = self.make_product()
+        del obj.translations[FIRST]['description']
+
+        self.assertIsNone(obj.get_dirty_translations())
+        self.assertEqual(update_value(obj), {FIRST: {'title': 'First'}, SECOND: {'title': 'Second'}})
+
+    def test_assignment_writes_column(self, is_enabled):
+        obj = self.make_product()
+        obj.translations = {FIRST: {'title': 'First'}}
+
+        self.assertIsNone(obj.get_dirty_translations())
+
+    def test_save_update_fields(self, is_enabled):
+        obj = self.make_product()
+        obj.translations[FIRST]['title'] = 'Changed'
+
+        with mock.patch.object(models.Model, 'save'):
+            obj.save(update_fields=['price'])
+            self.assertEqual(obj.get_dirty_translations(), {FIRST: {'title'}})
+
+            obj.save(update_fields=['translations'])
+            self.assertEqual(obj.get_dirty_translations(), {})
+
+    def test_refresh_deferred_translations(self, is_enabled):
+        obj = from_db(Product, id=1, title='Base', description='', price=0)
+        del obj.__dict__['translations']
+
+        def refresh_from_db(instance, using=None, fields=None):
+            instance.__dict__['translations'] = {FIRST: {'title': 'First'}}
+
+        with mock.patch.object(models.Model, 'refresh_from_db', refresh_from_db):
+            obj.refresh_from_db(fields=['translations'])
+
+        self.assertEqual(obj.get_dirty_translations(), {})
+        obj.translations[FIRST]['title'] = 'Changed'
+        self.assertEqual(obj.get_dirty_translations(), {FIRST: {'title'}})
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(Product, 'fallback', False)
+@mock.patch('json_trans.coverage.is_enabled', return_value=False)
+class SlicedTranslationsTests(SimpleTestCase):
+
+    def setUp(self):
+        patch = fallback_chains()
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def fetch(self, queryset):
+        """
+        Returns the objects of `queryset` from a row with the `FIRST` slice,
+        and the SQL it ran.
+        """
+        queries = []
+
+        def execute_sql(compiler, *args, **kwargs):
+            queries.append(compiler.as_sql())
+            return iter([[(1, 'Base', '', 0, {FIRST: {'title': 'First', 'description': None}})]])
+
+        with mock.patch.object(SQLCompiler, 'execute_sql', autospec=True, side_effect=execute_sql):
+            return list(queryset), queries
+
+    def test_selects_language_slice(self, is_enabled):
+        (obj,), ((sql, params),) = self.fetch(Product.objects.language(FIRST, slice=True))
+
+        self.assertNotIn('"json_trans_test_product"."translations",', sql)
+        self.assertIn('jsonb_build_object(%s, ("json_trans_test_product"."translations" -> %s))', sql)
+        self.assertEqual(params[:2], (FIRST, FIRST))
+        self.assertEqual(obj.translations, {FIRST: {'title': 'First', 'description': None}})
+        self.assertEqual(obj._loaded_languages, (FIRST,))
+
+        with translation.override(FIRST):
+            self.assertEqual(obj.title, 'First')
+
+    def test_language_slices_clone(self, is_enabled):
+        queryset = Product.objects.language(FIRST)
+        queryset.language(FIRST, slice=True)
+
+        self.assertIsNone(queryset._translation_slice)
+
+    def test_save_merges_loaded_languages(self, is_enabled):
+        obj = self.fetch(Product.objects.language(FIRST, slice=True))[0][0]
+        obj.translations = {FIRST: {'title': 'Changed'}}
+        value = update_value(obj)
+
+        self.assertEqual(value.sql, "(COALESCE(translations, '{}'::jsonb) - %s::text[]) || %s::jsonb")
+        self.assertEqual(json_params(value), [[FIRST], {FIRST: {'title': 'Changed'}}])
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch('json_trans.managers.transaction.atomic')
+class BulkDefaultLanguageTests(SimpleTestCase):
+
+    def make_products(self):
+        return [
+            make_product(pk, {FIRST: {'title': 'First %d' % pk}}, title='Base %d' % pk).language(FIRST)
+            for pk in (1, 2)
+        ]
+
+    def update_params(self, update):
+        """
+        Returns the parameters of the single UPDATE of the mocked `update`.
+        """
+        self.assertEqual(update.call_count, 1)
+        queryset, kwargs = update.call_args[0][0], update.call_args[1]
+        query = queryset.query.chain(sql.UpdateQuery)
+        query.add_update_values(kwargs)
+        return query.get_compiler(queryset.db).as_sql()[1]
+
+    def test_bulk_translate(self, atomic):
+        with mock.patch.object(models.QuerySet, 'update', autospec=True, return_value=2) as update:
+            with translation.override(FIRST):
+                Product.objects.bulk_translate((obj for obj in self.make_products()), LANGUAGE_CODE)
+
+        params = self.update_params(update)
+        self.assertIn('Base 1', params)
+        self.assertIn('Base 2', params)
+        self.assertNotIn('First 1', params)
+
+    def test_bulk_update(self, atomic):
+        with mock.patch.object(models.QuerySet, 'update', autospec=True, return_value=2) as update:
+            with translation.override(FIRST):
+                Product.objects.all().bulk_update((obj for obj in self.make_products()), ['title'])
+
+        params = self.update_params(update)
+        self.assertIn('Base 1', params)
+        self.assertNotIn('First 1', params)
+
+    def test_bulk_update_plain_fields(self, atomic):
+        objs = self.make_products()
+        objs[0].price, objs[1].price = 10, 20
+
+        with mock.patch.object(models.QuerySet, 'update', autospec=True, return_value=2) as update:
+            with translation.override(FIRST):
+                Product.objects.bulk_update(objs, ['title', 'price'], batch_size=1)
+
+        self.assertEqual(update.call_count, 2)
+        self.assertEqual(sorted(update.call_args_list[1][1]), ['price', 'title'])
+        self.assertEqual(update.call_args_list[1][0][0].query.where.children[0].rhs, [2])
+
+    def test_bulk_update_errors(self, atomic):
+        with self.assertRaisesMessage(ValueError, 'cannot be used with primary key fields'):
+            Product.objects.bulk_update(self.make_products(), ['id'])
+
+        with self.assertRaisesMessage(ValueError, 'must have a primary key set'):
+            Product.objects.bulk_update([Product(title='New')], ['title'])
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(translation_coverage, 'COVERAGE', True)
+@mock.patch('json_trans.coverage.apply')
+class CoverageTests(SimpleTestCase):
+
+    def setUp(self):
+        self.calls = mock.MagicMock()
+        patches = [
+            mock.patch('django.db.transaction.atomic', self.calls.atomic),
+            mock.patch('django.db.models.query.QuerySet._fetch_all', autospec=True, side_effect=self.fetch_all),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def fetch_all(self, queryset):
+        if queryset._result_cache is None:
+            self.calls.query(queryset.query)
+            queryset._result_cache = []
+
+    def test_bulk_translate_applies_deltas(self, apply):
+        before = Counter({(FIRST, 'title'): 1})
+        after = Counter({(FIRST, 'title'): 2, (FIRST, 'description'): 1})
+
+        with mock.patch('json_trans.coverage.count_filled', side_effect=[(before, 2), (after, 2)]) as count_filled, \
+                mock.patch.object(Product.objects._queryset_class, '_bulk_translate_batch', return_value=2):
+            Product.objects.bulk_translate({1: {'title': 'A'}, 2: {'title': 'B'}}, FIRST)
+
+        self.assertEqual([c[0][4] for c in count_filled.call_args_list], [[1, 2], [1, 2]])
+        apply.assert_called_once_with(Product, DEFAULT_DB_ALIAS, after, before)
+        self.calls.query.assert_called_once_with(mock.ANY)
+        self.assertTrue(self.calls.query.call_args[0][0].select_for_update)
+
+    def test_save_reads_stored_row_in_transaction(self, apply):
+        obj = make_product(translations={FIRST: {'title': 'First'}})
+
+        with mock.patch.object(models.Model, 'save', self.calls.save), \
+                mock.patch('json_trans.coverage.stored_filled', self.calls.stored_filled), \
+                mock.patch('json_trans.coverage.record_save', self.calls.record_save):
+            obj.save()
+
+        self.assertEqual([name for name, args, kwargs in self.calls.mock_calls], [
+            'atomic', 'atomic().__enter__', 'stored_filled', 'save', 'record_save', 'atomic().__exit__',
+        ])
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch('json_trans.models.COMPACT_PICKLE', True)
+class CompactPickleTests(SimpleTestCase):
+
+    def unpickled(self):
+        obj = make_product(translations={FIRST: {'title': 'First'}, SECOND: {'title': 'Second'}})
+
+        with fallback_chains():
+            # Model.__reduce__() looks the test models up in the project's registry.
+            return translation_cache.from_state(Product, obj.language(FIRST).__getstate__())
+
+    @mock.patch('django.db.models.query.QuerySet.first', autospec=True, return_value={SECOND: {'title': 'Stored'}})
+    def test_reloads_dropped_language(self, first):
+        obj = self.unpickled()
+        self.assertEqual(obj.translations, {FIRST: {'title': 'First'}})
+
+        self.assertEqual(obj.language_as_dict(SECOND), {'title': 'Stored'})
+        self.assertEqual(first.call_count, 1)
+        self.assertEqual(set(first.call_args[0][0].query.sql_with_params()[1]), {SECOND, 1})
+
+        with translation.override(SECOND):
+            self.assertEqual(obj.language(SECOND).title, 'Stored')
+        self.assertEqual(first.call_count, 1)
+
+    @mock.patch('django.db.models.query.QuerySet.first', autospec=True)
+    def test_kept_language(self, first):
+        obj = self.unpickled()
+
+        with translation.override(FIRST):
+            self.assertEqual(obj.title, 'First')
+            self.assertEqual(obj.language_or_none(FIRST).title, 'First')
+
+        first.assert_not_called()
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+class MultiLanguageFormTests(SimpleTestCase):
+
+    def setUp(self):
+        self.form_class = modelform_factory(Product, form=MultiLanguageModelForm, fields=['title', 'price'])
+        self.first_title = translation_field_name('title', FIRST)
+
+    def test_fields_generated_per_class(self):
+        names = [translation_field_name('title', code) for code in OTHER_LANGUAGES]
+
+        self.assertEqual(sorted(self.form_class.base_fields), sorted(['title', 'price'] + names))
+        self.assertIn(str(dict(settings.LANGUAGES)[FIRST]).upper(), str(self.form_class.base_fields[self.first_title].label))
+        self.assertIsNot(self.form_class().fields[self.first_title], self.form_class().fields[self.first_title])
+
+    def test_initial_from_translations(self):
+        form = self.form_class(instance=make_product(translations={FIRST: {'title': 'First'}}))
+
+        self.assertEqual(form[self.first_title].value(), 'First')
+        self.assertIsNone(form[translation_field_name('title', SECOND)].value())
+
+    def test_translates_with_language_codes(self):
+        obj = make_product()
+        form = self.form_class({'title': 'Base', 'price': 1, self.first_title: 'First'}, instance=obj)
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(obj.translations[FIRST], {'title': 'First'})
+        self.assertEqual(set(obj.translations), {FIRST, SECOND})
+        self.assertEqual(obj.__dict__['title'], 'Base')
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(Product, 'fallback', False)
+class SearchTests(SimpleTestCase):
+
+    def setUp(self):
+        patch = fallback_chains()
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def sql(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return sql % tuple("'%s'" % (param,) for param in params)
+
+    def test_ranked(self):
+        sql = self.sql(Product.objects.language(FIRST).search('red dress'))
+
+        self.assertIn("ts_rank(to_tsvector('%s'::regconfig, " % search_config(FIRST), sql)
+        self.assertIn("plainto_tsquery('%s'::regconfig, 'red dress')) AS \"search_rank\"" % search_config(FIRST), sql)
+        self.assertTrue(sql.endswith('ORDER BY "search_rank" DESC'))
+
+    def test_unranked(self):
+        sql = self.sql(Product.objects.language(FIRST).search('red', rank=False))
+
+        self.assertNotIn('ts_rank', sql)
+        self.assertNotIn('ORDER BY', sql)
+
+    def test_matches_index(self):
+        sql = self.sql(Product.objects.language(FIRST).search('red', rank=False))
+        sql = sql.replace('"json_trans_test_product"."translations"', 'translations')
+        indexes = translation_indexes(Product, search=True, connection=connection)
+        expression = {name: expression for name, method, expression in indexes}[index_name(Product, 'search', FIRST)]
+
+        self.assertIn(' AND %s @@ ' % expression, sql)
+
+    def test_non_translatable_field(self):
+        with self.assertRaises(NonTranslatableFieldError):
+            Product.objects.language(FIRST).search('red', fields=['price'])
+
+    def test_config(self):
+        with mock.patch.dict('json_trans.search.SEARCH_CONFIGS', {FIRST: 'custom'}):
+            self.assertEqual(search_config(FIRST), 'custom')
+
+        self.assertEqual(search_config('xx-unknown'), 'simple')
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+class TransferTests(SimpleTestCase):
+
+    def records(self):
+        return [
+            TranslationRecord('json_trans.Product', 1, FIRST, {'title': 'Başlık "1"\n\tx\\'}, {'title': 'Title'}),
+            TranslationRecord('json_trans.Product', 2, FIRST, {'title': '<b>&</b>', 'description': 'D'},
+                              {'title': 'T2', 'description': ''}),
+        ]
+
+    def units(self, records):
+        return sorted(
+            (str(record.pk), record.language, name, value)
+            for record in records for name, value in record.fields.items()
+        )
+
+    def test_round_trip(self):
+        for extension, format_class in FORMATS.items():
+            with self.subTest(extension):
+                stream = io.StringIO()
+                writer = format_class(stream, FIRST)
+                writer.write_header()
+                for record in self.records():
+                    writer.write(record)
+                writer.write_footer()
+                stream.seek(0)
+
+                self.assertEqual(self.units(format_class.read(stream)), self.units(self.records()))
+
+    @mock.patch('json_trans.managers.TranslationQuerySet.bulk_translate', autospec=True)
+    @mock.patch('json_trans.transfer.transaction.atomic')
+    @mock.patch('json_trans.transfer.apps.get_model', return_value=Product)
+    def test_import_resumes_in_batches(self, get_model, atomic, bulk_translate):
+        records = self.records() + [TranslationRecord('json_trans.Product', 1, FIRST, {'description': 'D1'}, None)]
+        progress = mock.Mock()
+
+        self.assertEqual(import_records(records, batch_size=1, offset=1, progress=progress), 3)
+
+        self.assertEqual([c[0][1:] for c in bulk_translate.call_args_list], [
+            ({2: {'title': '<b>&</b>', 'description': 'D'}}, FIRST, 1),
+            ({1: {'description': 'D1'}}, FIRST, 1),
+        ])
+        self.assertEqual(progress.call_args_list, [mock.call(2), mock.call(3)])
+        self.assertEqual(atomic.call_count, 2)
+
+    def test_export_selects_languages(self):
+        queries = []
+
+        def execute_sql(compiler, *args, **kwargs):
+            queries.append(compiler.as_sql())
+            return iter([[(1, 'Base', '', {FIRST: {'title': 'First'}, SECOND: None})]])
+
+        with mock.patch.object(SQLCompiler, 'execute_sql', autospec=True, side_effect=execute_sql):
+            records = list(export_records(Product, [FIRST, SECOND], after=0))
+
+        self.assertEqual(records, [TranslationRecord('json_trans.Product', 1, FIRST, {'title': 'First'},
+                                                     {'title': 'Base', 'description': ''})])
+        sql, params = queries[0]
+        self.assertNotIn('"json_trans_test_product"."translations",', sql)
+        self.assertIn('"json_trans_test_product"."id" > %s', sql)
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch('json_trans.coverage.is_enabled', return_value=False)
+class TranslatedFileTests(SimpleTestCase):
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.media_root = media_root.name
+
+        patch = override_settings(MEDIA_ROOT=self.media_root)
+        patch.enable()
+        self.addCleanup(patch.disable)
+
+    def stored_files(self):
+        return sorted(os.listdir(os.path.join(self.media_root, translation_files.UPLOAD_TO)))
+
+    def test_deduplicated(self, is_enabled):
+        obj = from_db(Document, id=1, translations={}, attachment='')
+        obj.translate(FIRST, attachment=ContentFile(b'content', name='a.TXT'))
+        obj.translate(SECOND, attachment=ContentFile(b'content', name='b.txt'))
+
+        name = obj.translations[FIRST]['attachment']
+        self.assertEqual(obj.translations[SECOND]['attachment'], name)
+        self.assertTrue(name.endswith('.txt'))
+        self.assertEqual(self.stored_files(), [os.path.basename(name)])
+
+    @mock.patch.object(translation_files, 'FILE_WORKERS', 1)
+    @mock.patch.object(translation_files, '_executor', None)
+    @mock.patch.object(translation_files, 'write', return_value='uploads/picked.txt')
+    def test_thread_pool(self, write, is_enabled):
+        obj = from_db(Document, id=1, translations={}, attachment='')
+        obj.translate(FIRST, attachment=ContentFile(b'content', name='a.txt'))
+
+        self.assertEqual(len(obj._pending_uploads), 1)
+
+        with mock.patch.object(models.Model, 'save'):
+            obj.save()
+
+        self.assertIsNone(obj._pending_uploads)
+        self.assertEqual(obj.translations[FIRST]['attachment'], 'uploads/picked.txt')
+        write.assert_called_once_with(Document._meta.get_field('attachment').storage, mock.ANY, mock.ANY)
+
+    def test_language_as_dict_urls(self, is_enabled):
+        obj = from_db(Document, id=1, translations={
+            FIRST: {'attachment': 'uploads/a.txt'}, SECOND: {'attachment': '/media/uploads/b.txt'},
+        }, attachment='')
+
+        self.assertEqual(obj.language_as_dict(FIRST), {'attachment': '/media/uploads/a.txt'})
+        self.assertEqual(obj.language_as_dict(SECOND), {'attachment': '/media/uploads/b.txt'})
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(Product, 'fallback', False)
+class InstrumentationTests(SimpleTestCase):
+
+    def setUp(self):
+        for name in ('title', 'description'):
+            descriptor = Product.__dict__[name]
+            patch = mock.patch.object(Product, name, InstrumentedTranslatedFieldDescriptor(
+                descriptor.field, descriptor.descriptor,
+            ))
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_collect(self):
+        obj = make_product(translations={SECOND: {'title': 'Second'}})
+        receiver = mock.Mock()
+        missing_translation.connect(receiver, sender=Product)
+        self.addCleanup(missing_translation.disconnect, receiver, sender=Product)
+
+        with fallback_chains(SECOND), translation.override(FIRST), instrumentation.collect() as outer:
+            obj.language(FIRST)
+
+            with instrumentation.collect() as inner:
+                self.assertEqual((obj.title, obj.title, obj.description), ('Second', 'Second', ''))
+
+        self.assertEqual(
+            {name: inner.counts[name] for name in ('reads', 'resolves', 'fallbacks', 'missing')},
+            {'reads': 3, 'resolves': 2, 'fallbacks': 1, 'missing': 1},
+        )
+        self.assertEqual(outer.counts, inner.counts)
+        receiver.assert_called_once_with(
+            signal=missing_translation, sender=Product, instance=obj, field='description', language=FIRST,
+        )
+
+    @mock.patch.object(instrumentation, 'ENABLED', False)
+    def test_middleware_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            TranslationStatsMiddleware(HttpResponse)
+
+    @mock.patch.object(instrumentation, 'ENABLED', True)
+    def test_middleware(self):
+        def get_response(request):
+            instrumentation.record('reads', 1, 'read', 0.002)
+            response = HttpResponse()
+            response['Server-Timing'] = 'app;dur=1'
+            return response
+
+        request = RequestFactory().get('/')
+
+        with mock.patch.object(request_stats, 'send') as send:
+            response = TranslationStatsMiddleware(get_response)(request)
+
+        self.assertEqual(response['Server-Timing'], 'app;dur=1, jt-read;dur=2.000')
+        self.assertEqual(request.translation_stats.counts['reads'], 1)
+        send.assert_called_once_with(
+            sender=TranslationStatsMiddleware, request=request, stats=request.translation_stats,
+        )
+
+    @mock.patch.object(instrumentation, 'ENABLED', True)
+    def test_middleware_async(self):
+        async def get_response(request):
+            instrumentation.record('filters', 2, 'filter', 0.001)
+            return HttpResponse()
+
+        middleware = TranslationStatsMiddleware(get_response)
+        request = RequestFactory().get('/')
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = run(middleware(request))
+
+        self.assertEqual(response['Server-Timing'], 'jt-filter;dur=1.000')
+        self.assertEqual(request.translation_stats.counts['filters'], 2)
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(Product, 'fallback', False)
+class AsJSONTests(SimpleTestCase):
+
+    def as_json(self, queryset, rows, **kwargs):
+        """
+        Returns the chunks of `queryset.as_json()` over the JSON text `rows`,
+        and the SQL it ran.
+        """
+        queries = []
+
+        def execute_sql(compiler, *args, **kwargs):
+            queries.append(compiler.as_sql())
+            return iter([[(row,) for row in rows]])
+
+        with mock.patch.object(SQLCompiler, 'execute_sql', autospec=True, side_effect=execute_sql):
+            return list(queryset.as_json(**kwargs)), queries
+
+    def test_chunks(self):
+        rows = ['{"id": 1}', '{"id": 2}', '{"id": 3}']
+        chunks, queries = self.as_json(Product.objects.language(FIRST), rows, fields=['id'], chunk_size=2)
+
+        self.assertEqual(chunks, [b'[', b'{"id": 1},{"id": 2}', b',{"id": 3}', b']'])
+        self.assertEqual(json.loads(b''.join(chunks).decode()), [{'id': 1}, {'id': 2}, {'id': 3}])
+
+    def test_empty(self):
+        chunks, queries = self.as_json(Product.objects.language(FIRST), [])
+
+        self.assertEqual(chunks, [b'[', b']'])
+
+    def test_builds_objects_in_language(self):
+        with fallback_chains(SECOND):
+            chunks, ((sql, params),) = self.as_json(Product.objects.language(FIRST), [], fields=['id', 'title'])
+
+        self.assertTrue(sql.startswith('SELECT (jsonb_build_object(%s, "json_trans_test_product"."id", %s, COALESCE('))
+        self.assertNotIn('"json_trans_test_product"."translations",', sql)
+        self.assertEqual(params, ('id', 'title', '{%s,title}' % FIRST, '', '{%s,title}' % SECOND, ''))
+
+    @mock.patch('json_trans.managers.JSON_MEDIA_URL', '/media/')
+    def test_file_urls(self):
+        chunks, ((sql, params),) = self.as_json(Document.objects.language(FIRST), [], fields=['attachment'])
+
+        self.assertIn('ELSE %s || ', sql)
+        self.assertIn('/media/', params)
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(Product, 'fallback', False)
+@mock.patch.object(Review, 'fallback', False)
+class RelatedLanguageTests(SimpleTestCase):
+
+    def setUp(self):
+        patch = fallback_chains()
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def row(self, model, **values):
+        return tuple(values.get(f.attname) for f in model._meta.concrete_fields)
+
+    def product_row(self):
+        return self.row(Product, id=1, title='Base', description='', price=0,
+                        translations={FIRST: {'title': 'First'}})
+
+    def review_row(self):
+        return self.row(Review, id=2, product_id=1, body='Body', translations={FIRST: {'body': 'Translated'}})
+
+    def fetch(self, queryset, rows):
+        """
+        Returns the objects of `queryset`, each query answered with the rows
+        of its model from `rows`.
+        """
+        def execute_sql(compiler, *args, **kwargs):
+            compiler.as_sql()
+            return iter([[rows[compiler.query.model]]])
+
+        with mock.patch.object(SQLCompiler, 'execute_sql', autospec=True, side_effect=execute_sql):
+            return list(queryset)
+
+    def assertInLanguage(self, review, product):
+        self.assertEqual((review._language_code, product._language_code), (FIRST, FIRST))
+
+        with translation.override(FIRST):
+            self.assertEqual((review.body, product.title), ('Translated', 'First'))
+
+    def test_select_related(self):
+        (review,) = self.fetch(Review.objects.language(FIRST).select_related('product'), {
+            Review: self.review_row() + self.product_row(),
+        })
+
+        self.assertInLanguage(review, review.product)
+
+    def test_prefetch_foreign_key(self):
+        (review,) = self.fetch(Review.objects.language(FIRST).prefetch_related('product'), {
+            Review: self.review_row(), Product: self.product_row(),
+        })
+
+        self.assertInLanguage(review, review.product)
+
+    def test_prefetch_reverse(self):
+        (product,) = self.fetch(Product.objects.language(FIRST).prefetch_related('review_set'), {
+            Review: self.review_row(), Product: self.product_row(),
+        })
+        (review,) = product.review_set.all()
+
+        self.assertInLanguage(review, product)
+
+    def test_default_language(self):
+        (review,) = self.fetch(Review.objects.language(LANGUAGE_CODE).select_related('product'), {
+            Review: self.review_row() + self.product_row(),
+        })
+
+        with translation.override(FIRST):
+            self.assertEqual((review.body, review.product.title), ('Body', 'Base'))
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+class AsyncTests(SimpleTestCase):
+
+    def test_language_from_parameter(self):
+        self.assertEqual(get_language_from_parameter(FIRST.upper().replace('-', '_')), FIRST)
+        self.assertEqual(get_language_from_parameter(' %s ' % FIRST), FIRST)
+        self.assertIsNone(get_language_from_parameter('xx-unknown'))
+
+    def test_async_middleware(self):
+        async def get_response(request):
+            return HttpResponse(translation.get_language())
+
+        middleware = QueryParameterLocaleMiddleware(get_response)
+        request = RequestFactory().get('/', {'lang': FIRST})
+
+        self.assertTrue(iscoroutinefunction(middleware))
+
+        with translation.override(LANGUAGE_CODE):
+            response = run(middleware(request))
+
+        self.assertEqual(response.content.decode(), FIRST)
+        self.assertEqual(request.LANGUAGE_CODE, FIRST)
+
+    def test_sync_middleware(self):
+        middleware = QueryParameterLocaleMiddleware(lambda request: HttpResponse(translation.get_language()))
+
+        self.assertFalse(iscoroutinefunction(middleware))
+
+        with translation.override(LANGUAGE_CODE):
+            response = middleware(RequestFactory().get('/', {'lang': FIRST}))
+
+        self.assertEqual(response.content.decode(), FIRST)
+
+    def test_aiterator_fetches_chunks(self):
+        chunks = []
+
+        async def run_sync(func, *args):
+            result = func(*args)
+            chunks.append(result)
+            return result
+
+        async def collect():
+            return [obj async for obj in Product.objects.language(FIRST).aiterator(chunk_size=2)]
+
+        with mock.patch('json_trans.managers.TranslationQuerySet.iterator', return_value=iter(range(5))), \
+                mock.patch('json_trans.managers.run_sync', run_sync):
+            self.assertEqual(run(collect()), [0, 1, 2, 3, 4])
+
+        self.assertEqual(chunks, [[0, 1], [2, 3], [4], []])
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+class CursorTests(SimpleTestCase):
+
+    def test_invalid_cursor(self):
+        queryset = Product.objects.language_or_default(FIRST)
+
+        with self.assertRaises(InvalidCursorError):
+            queryset.keyset_page('title', cursor='tampered')
+
+    def test_cursor_of_other_language(self):
+        cursor = encode_cursor('title', LANGUAGE_CODE, False, 'a', 1)
+
+        with self.assertRaises(InvalidCursorError):
+            Product.objects.language_or_default(FIRST).keyset_page('title', cursor=cursor)
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+@mock.patch.object(translation_cache, 'CACHE_ALIAS', 'json_trans_tests')
+@mock.patch.dict(settings.CACHES, json_trans_tests={'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'})
+class CachedResultsTests(SimpleTestCase):
+
+    def cached(self, key='key'):
+        """
+        Returns the titles of the cached queryset and how many queries and
+        cache reads it took.
+        """
+        queries = []
+
+        def fetch_all(queryset):
+            if queryset._result_cache is None:
+                queries.append(queryset.query)
+                queryset._result_cache = [make_product(translations={FIRST: {'title': 'First'}}).language(FIRST)]
+
+        cache = translation_cache.get_cache()
+
+        with mock.patch('django.db.models.query.QuerySet._fetch_all', autospec=True, side_effect=fetch_all), \
+                mock.patch.object(cache, 'get', wraps=cache.get) as get, translation.override(FIRST):
+            titles = [obj.title for obj in Product.objects.language(FIRST).cached(key)]
+
+        return titles, len(queries), get.call_count
+
+    def test_hit(self):
+        self.assertEqual(self.cached(), (['First'], 1, 2))
+        self.assertEqual(self.cached(), (['First'], 0, 2))
+
+    def test_invalidate(self):
+        self.cached()
+        translation_cache.invalidate(make_product())
+        self.assertEqual(self.cached(), (['First'], 1, 2))
+        self.assertEqual(self.cached(), (['First'], 0, 2))
+
+
+@skipUnless(FIRST, 'The tests need a language other than LANGUAGE_CODE in settings.LANGUAGES.')
+@skipUnless(apps.is_installed('django.contrib.admin'), 'django.contrib.admin is not installed.')
+class AdminTests(SimpleTestCase):
+
+    def setUp(self):
+        from django.contrib.admin.sites import AdminSite
+        from .admin import TranslatableModelAdmin
+
+        class ProductAdmin(TranslatableModelAdmin):
+            list_display = ('title', 'price')
+            ordering = ('-title',)
+            search_fields = ('title',)
+
+        self.admin = ProductAdmin(Product, AdminSite())
+        self.request = RequestFactory().get('/', {'q': 'word'})
+        self.request.user = mock.MagicMock(is_active=True, is_staff=True, is_superuser=True)
+
+    def test_get_queryset_orders_by_base_column(self):
+        with translation.override(FIRST):
+            query = str(self.admin.get_queryset(self.request).query)
+
+        self.assertNotIn('title_translated', query)
+        self.assertIn('ORDER BY "json_trans_test_product"."title" DESC', query)
+
+    def test_autocomplete_search(self):
+        with translation.override(FIRST):
+            queryset = self.admin.get_queryset(self.request)
+            self.assertIn('title_translated', str(self.admin.get_search_results(self.request, queryset, 'word')[0].query))
+            self.assertNotIn('title_translated', str(self.admin.get_search_results(self.request, queryset, '')[0].query))
+
+    @mock.patch('django.contrib.admin.views.main.ChangeList.get_results')
+    def test_changelist_sorts_translated_column(self, get_results):
+        with translation.override(FIRST):
+            changelist = self.admin.get_changelist_instance(self.request)
+            query = str(changelist.queryset.query)
+
+        self.assertIn('AS "title_translated"', query)
+        self.assertIn('ORDER BY "title_translated" DESC', query)
+        self.assertEqual(changelist.get_ordering_field_columns(), {1: 'desc'})
+
+
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+class CreateTranslationIndexesTests(SimpleTestCase):
+
+    def setUp(self):
+        # Historical models have no translatable_fields, translation_storage or fallback.
+        self.state = ProjectState()
+        self.state.add_model(ModelState('json_trans', 'Product', [
+            ('id', models.AutoField(primary_key=True)),
+            ('title', models.CharField(max_length=255)),
+            ('translations', JSONField(null=True)),
+        ], {'db_table': 'json_trans_test_product'}))
+
+    def forwards(self, operation):
+        editor = mock.Mock(connection=connection)
+
+        with mock.patch.object(connection, 'vendor', 'postgresql'):
+            operation.database_forwards('json_trans', editor, ProjectState(), self.state)
+
+        return [args[0] for args, kwargs in editor.execute.call_args_list]
+
+    def test_historical_model(self):
+        operation = CreateTranslationIndexes('product', fields=['title'], fallback_chains={FIRST: [FIRST, SECOND]})
+        statements = self.forwards(operation)
+
+        self.assertEqual(len(statements), 1 + len(OTHER_LANGUAGES))
+        self.assertTrue(any(
+            "COALESCE(NULLIF((translations #>> '{%s,title}'), ''), NULLIF((translations #>> '{%s,title}'), ''))"
+            % (FIRST, SECOND) in sql for sql in statements
+        ))
+        self.assertTrue(any("((translations #>> '{%s,title}'))" % SECOND in sql for sql in statements))
+
+    def test_table_storage(self):
+        self.assertEqual(self.forwards(CreateTranslationIndexes('product', fields=['title'], storage='table')), [])
+
+    def test_deconstruct(self):
+        operation = CreateTranslationIndexes(
+            'product', fields=['title'], search=True, fallback_chains={FIRST: [FIRST, SECOND]},
+        )
+        name, args, kwargs = operation.deconstruct()
+
+        self.assertEqual(name, 'CreateTranslationIndexes')
+        self.assertEqual(kwargs, {
+            'model_name': 'product', 'fields': ['title'], 'search': True, 'fallback_chains': {FIRST: [FIRST, SECOND]},
+        })
+        self.assertEqual(self.forwards(CreateTranslationIndexes(*args, **kwargs)), self.forwards(operation))
+
+
+@skipUnless(connection.vendor == 'postgresql', 'json_trans requires PostgreSQL.')
+@skipUnless(SECOND, 'The tests need two languages other than LANGUAGE_CODE in settings.LANGUAGES.')
+class PostgreSQLTestCase(TestCase):
+    """
+    Creates the tables of the test models in the transaction of the class.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        with connection.schema_editor() as editor:
+            for model in (Product, Article, Article._meta.translation_model, Comment):
+                editor.create_model(model)
+
+
+class SaveTests(PostgreSQLTestCase):
+
+    def stored(self, obj):
+        return Product.objects.values_list('title', 'translations').get(pk=obj.pk)
+
+    def test_in_place_change_keeps_other_writes(self):
+        obj = Product.objects.create(title='Base', translations={FIRST: {'title': 'First', 'description': 'D'}})
+        obj = Product.objects.get(pk=obj.pk)
+        Product.objects.filter(pk=obj.pk).update_translation(SECOND, title='Second')
+
+        obj.translations[FIRST]['title'] = 'Changed'
+        obj.save()
+
+        self.assertEqual(self.stored(obj), (
+            'Base', {FIRST: {'title': 'Changed', 'description': 'D'}, SECOND: {'title': 'Second'}},
+        ))
+
+    def test_save_update_fields_keeps_changes(self):
+        obj = Product.objects.create(title='Base', translations={FIRST: {'title': 'First'}})
+        obj = Product.objects.get(pk=obj.pk)
+
+        obj.translations[FIRST]['title'] = 'Changed'
+        obj.save(update_fields=['price'])
+        obj.save(update_fields=['translations'])
+
+        self.assertEqual(self.stored(obj), ('Base', {FIRST: {'title': 'Changed'}}))
+
+    def test_bulk_translate_default_language(self):
+        Product.objects.create(title='Base', translations={FIRST: {'title': 'First'}})
+        objs = list(Product.objects.language(FIRST))
+
+        with translation.override(FIRST):
+            objs[0].title = 'New base'
+            Product.objects.bulk_translate(iter(objs), LANGUAGE_CODE)
+
+        self.assertEqual(self.stored(objs[0]), ('New base', {FIRST: {'title': 'First'}}))
+
+
+class TableStorageTests(PostgreSQLTestCase):
+
+    def setUp(self):
+        self.article = Article.objects.create(title='Base')
+        self.article.translate(FIRST, title='First')
+        self.article.save()
+
+    def test_foreign_key(self):
+        comment = Comment.objects.create(article=self.article)
+        article = Comment.objects.get(pk=comment.pk).article
+
+        with translation.override(FIRST):
+            self.assertEqual(article.language(FIRST).title, 'First')
+
+    def test_base_manager(self):
+        article = Article._base_manager.get(pk=self.article.pk)
+
+        with translation.override(FIRST):
+            self.assertEqual(article.language(FIRST).title, 'First')
+
+    def test_refresh_from_db(self):
+        article = Article.objects.language(FIRST).get(pk=self.article.pk)
+        Article.objects.filter(pk=article.pk).update_translation(FIRST, title='Updated')
+        article.refresh_from_db()
+
+        with translation.override(FIRST):
+            self.assertEqual(article.title, 'Updated')
+
+    def test_save_writes_changed_language(self):
+        article = Article.objects.language(FIRST).get(pk=self.article.pk)
+        article.translate(SECOND, title='Second')
+        article.save()
+
+        rows = Article._meta.translation_model.objects.filter(master=article).values_list('language_code', 'data')
+        self.assertEqual(dict(rows), {FIRST: {'title': 'First'}, SECOND: {'title': 'Second'}})
+
+
+class KeysetPaginationTests(PostgreSQLTestCase):
+
+    @fallback_chains()
+    @mock.patch.object(Product, 'fallback', False)
+    def test_cursor_round_trip(self):
+        titles = ['b', 'a', 'c', None, None]
+        pks = [
+            Product.objects.create(title='Base', translations={FIRST: {'title': title}} if title else {}).pk
+            for title in titles
+        ]
+        queryset = Product.objects.language_or_default(FIRST)
+        pages, cursor = [], None
+
+        while True:
+            page = queryset.keyset_page('title', cursor=cursor, size=2)
+            pages.append([obj.pk for obj in page.object_list])
+
+            if not page.has_next:
+                break
+
+            cursor = page.next_cursor
+
+        # Translated rows by title and pk, then the ones without a title by pk.
+        self.assertEqual(pages, [[pks[1], pks[0]], [pks[2], pks[3]], [pks[4]]])
@@ -0,0 +1,278 @@
+"""
+Streaming import and export of translations in JSONL, PO and XLIFF 1.2
+formats, used by the `json_trans_export` and `json_trans_import` commands.
+"""
+import json
+from collections import namedtuple
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape, quoteattr
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .expressions import sliced_translations
+from .managers import TranslationQuerySet
+
+TranslationRecord = namedtuple('TranslationRecord', 'model pk language fields source')
+
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 1000
+TRANSLATIONS = '_translations'
+
+
+def unit_id(record, field_name):
+    return '%s:%s:%s' % (record.model, record.pk, field_name)
+
+
+def parse_unit_id(value):
+    model, rest = value.split(':', 1)
+    pk, field_name = rest.rsplit(':', 1)
+    return model, pk, field_name
+
+
+class JSONLFormat(object):
+    """
+    One JSON object per line:
+    {"model": "app.model", "pk": 1, "language": "tr-tr", "fields": {...}, "source": {...}}
+    """
+    extension = 'jsonl'
+
+    def __init__(self, stream, language_code=None):
+        self.stream = stream
+
+    def write_header(self):
+        pass
+
+    def write(self, record):
+        self.stream.write(json.dumps(record._asdict(), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n')
+
+    def write_footer(self):
+        pass
+
+    @classmethod
+    def read(cls, stream, language_code=None):
+        for line in stream:
+            if line.strip():
+                data = json.loads(line)
+                yield TranslationRecord(
+                    data['model'], data['pk'], language_code or data['language'], data['fields'], data.get('source'),
+                )
+
+
+class POFormat(object):
+    """
+    A gettext catalog of one language, each translated field is an entry whose
+    msgctxt is `app.model:pk:field`.
+    """
+    extension = 'po'
+
+    def __init__(self, stream, language_code=None):
+        self.stream = stream
+        self.language_code = language_code
+
+    @staticmethod
+    def quote(value):
+        value = '' if value is None else str(value)
+        for char, escaped in (('\\', '\\\\'), ('"', '\\"'), ('\n', '\\n'), ('\r', '\\r'), ('\t', '\\t')):
+            value = value.replace(char, escaped)
+        return '"%s"' % value
+
+    @staticmethod
+    def unquote(value):
+        value = value.strip()[1:-1]
+        result, chars = [], iter(value)
+        for char in chars:
+            if char == '\\':
+                char = next(chars, '')
+                char = {'n': '\n', 'r': '\r', 't': '\t'}.get(char, char)
+            result.append(char)
+        return ''.join(result)
+
+    def write_header(self):
+        self.stream.write(
+            'msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n"Language: %s\\n"\n\n' % self.language_code
+        )
+
+    def write(self, record):
+        for name, value in record.fields.items():
+            self.stream.write('msgctxt %s\nmsgid %s\nmsgstr %s\n\n' % (
+                self.quote(unit_id(record, name)), self.quote((record.source or {}).get(name)), self.quote(value),
+            ))
+
+    def write_footer(self):
+        pass
+
+    @classmethod
+    def read(cls, stream, language_code=None):
+        entry, key = {}, None
+
+        def build(entry):
+            if entry.get('msgctxt') and entry.get('msgstr'):
+                model, pk, field_name = parse_unit_id(entry['msgctxt'])
+                return TranslationRecord(
+                    model, pk, language_code, {field_name: entry['msgstr']}, {field_name: entry.get('msgid')},
+                )
+
+        for line in stream:
+            line = line.strip()
+
+            if not line or line.startswith('#'):
+                continue
+
+            if line.startswith('"'):
+                if key:
+                    entry[key] += cls.unquote(line)
+                continue
+
+            key, value = line.split(' ', 1)
+
+            if key in ('msgctxt', 'msgid') and 'msgstr' in entry:
+                record = build(entry)
+                if record:
+                    yield record
+                elif language_code is None and not entry.get('msgctxt'):
+                    language_code = cls.header_language(entry['msgstr'])
+                entry = {}
+
+            entry[key] = cls.unquote(value)
+
+        record = build(entry)
+        if record:
+            yield record
+
+    @staticmethod
+    def header_language(header):
+        for line in header.splitlines():
+            if line.lower().startswith('language:'):
+                return line.split(':', 1)[1].strip()
+
+
+class XLIFFFormat(object):
+    """
+    An XLIFF 1.2 document of one language, each translated field is a
+    trans-unit whose id is `app.model:pk:field`.
+    """
+    extension = 'xlf'
+    namespace = 'urn:oasis:names:tc:xliff:document:1.2'
+
+    def __init__(self, stream, language_code=None):
+        self.stream = stream
+        self.language_code = language_code
+
+    def write_header(self):
+        self.stream.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<xliff version="1.2" xmlns="%s">\n'
+            '<file original="json_trans" datatype="plaintext" source-language=%s target-language=%s>\n'
+            '<body>\n' % (self.namespace, quoteattr(settings.LANGUAGE_CODE), quoteattr(self.language_code))
+        )
+
+    def write(self, record):
+        for name, value in record.fields.items():
+            source = (record.source or {}).get(name)
+            self.stream.write('<trans-unit id=%s><source>%s</source><target>%s</target></trans-unit>\n' % (
+                quoteattr(unit_id(record, name)),
+                escape('' if source is None else str(source)),
+                escape('' if value is None else str(value)),
+            ))
+
+    def write_footer(self):
+        self.stream.write('</body>\n</file>\n</xliff>\n')
+
+    @classmethod
+    def read(cls, stream, language_code=None):
+        file_language = language_code
+
+        for event, element in iterparse(stream, events=('start', 'end')):
+            tag = element.tag.rsplit('}', 1)[-1]
+
+            if event == 'start':
+                if tag == 'file':
+                    file_language = language_code or element.get('target-language')
+                continue
+
+            if tag == 'trans-unit':
+                target = element.find('{%s}target' % cls.namespace)
+                if target is None:
+                    target = element.find('target')
+
+                if target is not None and target.text:
+                    model, pk, field_name = parse_unit_id(element.get('id'))
+                    yield TranslationRecord(model, pk, file_language, {field_name: target.text}, None)
+
+                element.clear()
+
+
+FORMATS = {f.extension: f for f in (JSONLFormat, POFormat, XLIFFFormat)}
+FORMATS['xliff'] = XLIFFFormat
+
+
+def export_records(model, language_codes, using=DEFAULT_DB_ALIAS, after=None,
+                   chunk_size=EXPORT_CHUNK_SIZE, include_missing=False):
+    """
+    Yields a `TranslationRecord` per object and language of `model`, in pk
+    order and after the `after` pk if given. Rows are streamed with a server
+    side cursor and only the exported languages of `translations` are fetched.
+    """
+    fields = model._meta.translatable_fields
+    queryset = model._base_manager.using(using).order_by('pk')
+
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+
+    queryset = queryset.annotate(**{TRANSLATIONS: sliced_translations(language_codes, model)})
+
+    for pk, translations, *source in queryset.values_list('pk', TRANSLATIONS, *fields).iterator(chunk_size=chunk_size):
+        source = dict(zip(fields, source))
+
+        for code in language_codes:
+            translated = (translations or {}).get(code) or {}
+
+            if include_missing:
+                translated = {name: translated.get(name, '') for name in fields}
+            else:
+                translated = {name: translated[name] for name in fields if name in translated}
+
+            if translated:
+                yield TranslationRecord(model._meta.label, pk, code, translated, source)
+
+
+def import_records(records, using=DEFAULT_DB_ALIAS, batch_size=IMPORT_BATCH_SIZE, offset=0, progress=None):
+    """
+    Writes `records` with `TranslationQuerySet.bulk_translate()`, committing a
+    transaction every `batch_size` records. The first `offset` records are
+    skipped so an interrupted import can be resumed, `progress` is called with
+    the offset reached after every committed batch. Returns that offset.
+    """
+    pending = {}
+    position = offset
+    count = 0
+
+    def flush():
+        with transaction.atomic(using=using):
+            for (label, language_code), mapping in pending.items():
+                queryset = TranslationQuerySet(apps.get_model(label), using=using)
+                queryset.bulk_translate(mapping, language_code, batch_size)
+        pending.clear()
+
+        if progress:
+            progress(position)
+
+    for index, record in enumerate(records):
+        if index < offset:
+            continue
+
+        group = pending.setdefault((record.model, record.language), {})
+        group.setdefault(record.pk, {}).update(record.fields)
+        position = index + 1
+        count += 1
+
+        if count % batch_size == 0:
+            flush()
+
+    if pending:
+        flush()
+
+    return position
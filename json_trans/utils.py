@@ -0,0 +1,64 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.apps import apps
+
+try:
+    from asgiref.sync import sync_to_async
+except ImportError:  # Django < 3.0
+    sync_to_async = None
+
+try:
+    from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+except ImportError:  # asgiref < 3.7, i.e. Python < 3.12
+    iscoroutinefunction = asyncio.iscoroutinefunction
+
+    def markcoroutinefunction(func):
+        # The marker documented by Django < 4.2 for async middleware instances.
+        func._is_coroutine = asyncio.coroutines._is_coroutine
+        return func
+
+# Without asgiref, database calls of the async API run in this single thread,
+# like asgiref's thread sensitive mode, so they share one connection.
+_executor = None
+
+
+def get_translatable_models(labels=None):
+    """
+    Returns the concrete `TranslatableModel`s of the given `app_label` or
+    `app_label.ModelName` labels, or of every installed app. Raises
+    `LookupError` for unknown labels.
+    """
+    from .models import TranslatableModel
+
+    if not labels:
+        candidates = apps.get_models()
+    else:
+        candidates = []
+        for label in labels:
+            if '.' in label:
+                candidates.append(apps.get_model(label))
+            else:
+                candidates.extend(apps.get_app_config(label).get_models())
+
+    return [
+        model for model in candidates
+        if issubclass(model, TranslatableModel) and not model._meta.proxy and model._meta.managed
+    ]
+
+
+def run_sync(func, *args, **kwargs):
+    """
+    Returns an awaitable running `func(*args, **kwargs)` outside of the event
+    loop, with asgiref's `sync_to_async()` if it's installed.
+    """
+    global _executor
+
+    if sync_to_async is not None:
+        return sync_to_async(func)(*args, **kwargs)
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='json_trans')
+
+    return asyncio.get_event_loop().run_in_executor(_executor, partial(func, *args, **kwargs))